@@ -3,34 +3,138 @@ Ollama-based Data Converter API
 Converts unstructured data (text, CSV, JSON, etc.) into structured Startup/Investor format
 """
 
-from fastapi import FastAPI, HTTPException, UploadFile, File
+from fastapi import FastAPI, HTTPException, UploadFile, File, Header
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
-from pydantic import BaseModel
-from typing import List, Optional, Dict, Any, Tuple, AsyncGenerator
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, ConfigDict, TypeAdapter
+from typing import List, Optional, Dict, Any, Tuple, AsyncGenerator, Iterator, Union
+from contextlib import asynccontextmanager
 import ollama
 import os
 import httpx
 import json
 import re
-from io import StringIO
+from io import BytesIO, StringIO
 import csv
+import zipfile
 import asyncio
+import math
+import operator
+import time
+import random
+import hashlib
+import sqlite3
+import tempfile
+from collections import OrderedDict
+from itertools import chain
+from functools import lru_cache, partial
+from concurrent.futures import ThreadPoolExecutor
 
-app = FastAPI(title="Ollama Data Converter API")
+import orjson
+
+
+def json_loads(data: Union[bytes, str]) -> Any:
+    """Parse JSON with orjson (accepts raw bytes, so no text decode first)."""
+    return orjson.loads(data)
+
+
+def json_dumps(obj: Any) -> bytes:
+    """Serialize to UTF-8 JSON bytes, e.g. for httpx `content=` request bodies."""
+    return orjson.dumps(obj)
+
+
+def model_fields_default(obj: Any) -> Any:
+    """
+    `default` hook for orjson: serialize a pydantic model from its field dict directly, so
+    lists of records can go into a response without a model_dump() copy per row.
+    """
+    if isinstance(obj, BaseModel):
+        return obj.__dict__
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class OrjsonResponse(JSONResponse):
+    """JSONResponse rendered with orjson: large conversion results serialize several times faster."""
+
+    # Non-str dict keys are allowed by default since this is the app-wide response class
+    orjson_option = orjson.OPT_NON_STR_KEYS
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=self.orjson_option, default=model_fields_default)
+
+
+class StrKeyOrjsonResponse(OrjsonResponse):
+    """
+    OrjsonResponse for payloads built only from str-keyed dicts and models: orjson's non-str-key
+    handling takes a slower path for every dict, ~15% of the render time for a large record list.
+    """
+
+    orjson_option = 0
+
+
+def model_json_response(model: BaseModel) -> Response:
+    """
+    Serialize a response model straight to JSON bytes in pydantic-core. Returning the model itself
+    makes FastAPI re-validate it against response_model and dump it to dicts before rendering,
+    which dominates for results with thousands of records.
+    """
+    return Response(content=model.model_dump_json(), media_type="application/json")
+
+# Hot-path patterns, compiled once (normalizers run them per field per row)
+_DIGITS_RE = re.compile(r'[^\d.]')
+_LIST_SPLIT_RE = re.compile(r'[,;|]')
+_LABEL_SPLIT_RE = re.compile(r'[;|]|,\s+')  # "label, label" but not "1,000,000"
+_WS_NEWLINE_RE = re.compile(r"\s+\n")
+_MANY_NEWLINES_RE = re.compile(r"\n{3,}")
+_JSON_FENCE_RE = re.compile(r'```(?:json)?\n?')
+_HDR_BRACKETS_RE = re.compile(r'\[.*?\]')
+_HDR_NONALNUM_RE = re.compile(r'[^a-z0-9\s]')
+_WS_RE = re.compile(r'\s+')
+# Byte table mapping control bytes (everything below 0x20 except tab/newline, plus DEL) to spaces
+_DOC_CTRL_BYTES = bytes(range(0x00, 0x09)) + bytes(range(0x0B, 0x20)) + b'\x7f'
+_DOC_CTRL_TABLE = bytes.maketrans(_DOC_CTRL_BYTES, b' ' * len(_DOC_CTRL_BYTES))
+_XML_TAG_RE = re.compile(r'<[^>]+>')
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Open the shared HTTP clients up front so the first request doesn't pay for pool setup,
+    # and close them on shutdown so keep-alive sockets are released cleanly.
+    get_anthropic_http()
+    get_ollama_http()
+    get_external_http()
+    # Warm up in the background: startup shouldn't block on (or fail because of) model hosts.
+    prewarm_task = asyncio.create_task(prewarm_models()) if PREWARM_MODELS else None
+    yield
+    if prewarm_task is not None and not prewarm_task.done():
+        prewarm_task.cancel()
+    await close_http_clients()
+    shutdown_ocr_executor()
+
+
+app = FastAPI(title="Ollama Data Converter API", lifespan=lifespan, default_response_class=OrjsonResponse)
 
 # Limit how much extracted text we send to the model (large PDFs often cause truncated JSON output).
 # This keeps responses short enough to remain valid JSON.
 MAX_MODEL_INPUT_CHARS = int(os.environ.get("MAX_MODEL_INPUT_CHARS", "24000"))
+# Longer inputs are converted as overlapping MAX_MODEL_INPUT_CHARS-sized chunks in parallel and merged;
+# the overlap lets a record cut at a chunk boundary still appear whole in one of them
+MODEL_INPUT_CHUNK_OVERLAP = int(os.environ.get("MODEL_INPUT_CHUNK_OVERLAP", "200"))
+# Upper bound on model calls per conversion (anything past the last chunk is dropped with a warning)
+MAX_MODEL_INPUT_CHUNKS = max(1, int(os.environ.get("MAX_MODEL_INPUT_CHUNKS", "8")))
 
 # OCR settings (for scanned/image PDFs)
 OCR_MAX_PAGES = int(os.environ.get("OCR_MAX_PAGES", "5"))
 OCR_DPI = int(os.environ.get("OCR_DPI", "200"))
+# Max OCR jobs (page renders / Tesseract processes) in flight across all requests
+OCR_CONCURRENCY = int(os.environ.get("OCR_CONCURRENCY", str(os.cpu_count() or 2)))
+# Above this many pages, skip single-invocation batch OCR (very large lists can deadlock Tesseract's pipe)
+OCR_BATCH_MAX_PAGES = int(os.environ.get("OCR_BATCH_MAX_PAGES", "50"))
+# Pages whose embedded text layer has at least this many characters are used as-is, not OCR'd
+OCR_MIN_TEXT_CHARS = int(os.environ.get("OCR_MIN_TEXT_CHARS", "200"))
 # Limit PDF pages to reduce timeouts on large files
 MAX_PDF_PAGES = int(os.environ.get("MAX_PDF_PAGES", "8"))
 # Claude Vision API for complex PDFs (uses existing ANTHROPIC_API_KEY)
-# Parallel processing settings
-MAX_PARALLEL_PAGES = int(os.environ.get("MAX_PARALLEL_PAGES", "10"))
 
 
 async def extract_with_claude_vision(page_images: List[bytes]) -> str:
@@ -91,18 +195,18 @@ Return the extracted text in a clear, structured format."""
                 ]
             }
             
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                res = await client.post(url, headers=headers, json=payload)
-                res.raise_for_status()
-                data = res.json()
-                content = data.get("content", [])
-                if isinstance(content, list) and content:
-                    page_text = content[0].get("text", "") if content[0].get("type") == "text" else ""
-                else:
-                    page_text = str(content) if content else ""
+            client = get_anthropic_http()
+            res = await client.post(url, headers=headers, content=json_dumps(payload))
+            res.raise_for_status()
+            data = json_loads(res.content)
+            content = data.get("content", [])
+            if isinstance(content, list) and content:
+                page_text = content[0].get("text", "") if content[0].get("type") == "text" else ""
+            else:
+                page_text = str(content) if content else ""
                 
-                if page_text:
-                    parts.append(f"\n--- Page {idx} (Claude Vision) ---\n{page_text}")
+            if page_text:
+                parts.append(f"\n--- Page {idx} (Claude Vision) ---\n{page_text}")
         except Exception as e:
             print(f"Claude Vision extraction failed for page {idx}: {e}")
             parts.append(f"\n--- Page {idx} (Claude Vision failed: {e}) ---\n")
@@ -110,51 +214,214 @@ Return the extracted text in a clear, structured format."""
     return "\n".join(parts).strip() if parts else None
 
 
-def try_ocr_pdf_bytes(content: bytes) -> str:
+async def try_ocr_pdf_bytes(content: bytes) -> str:
     """
     Best-effort OCR for scanned/image-only PDFs.
     Requires:
       - pytesseract (python)
-      - pdf2image (python)
       - Tesseract installed on the OS
-      - Poppler installed on the OS (Windows: poppler-utils)
+      - PyMuPDF for rendering (or pdf2image + Poppler as a fallback; Windows: poppler-utils)
+
+    Pages that already carry a usable text layer are taken from it and never rasterized;
+    only the remaining pages are OCR'd, split across concurrent Tesseract runs
+    (see ocr_images_in_parallel_batches).
     """
+    layer_texts = await run_in_ocr_executor(probe_pdf_text_layer, content)
+    ocr_pages = [i for i, t in enumerate(layer_texts) if len(t.strip()) < OCR_MIN_TEXT_CHARS]
+    if layer_texts and not ocr_pages:
+        return "\n".join(f"\n--- Page {i} ---\n{t.strip()}" for i, t in enumerate(layer_texts, start=1)).strip()
+
     try:
-        from pdf2image import convert_from_bytes  # type: ignore
         import pytesseract  # type: ignore
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=(
                 "Scanned/image PDF detected but OCR dependencies are missing. "
-                "Install: pip install pytesseract pdf2image, then install Tesseract + Poppler on Windows. "
-                f"Error: {str(e)}"
-            ),
-        )
-
-    try:
-        images = convert_from_bytes(content, dpi=OCR_DPI, first_page=1, last_page=max(1, OCR_MAX_PAGES))
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=(
-                "Failed to render PDF pages for OCR. On Windows you usually need Poppler installed and on PATH. "
+                "Install: pip install pytesseract PyMuPDF, then install Tesseract on the OS. "
                 f"Error: {str(e)}"
             ),
         )
 
-    parts: List[str] = []
-    for idx, img in enumerate(images, start=1):
+    # Pages are rendered to image files that Tesseract reads directly, so memory stays flat
+    # however many pages are OCR'd
+    with tempfile.TemporaryDirectory(prefix="ocr-") as tmp_dir:
         try:
-            txt = pytesseract.image_to_string(img) or ""
-            txt = re.sub(r"\s+\n", "\n", txt)
-            txt = re.sub(r"\n{3,}", "\n\n", txt).strip()
-            parts.append(f"\n--- OCR Page {idx} ---\n{txt}")
+            # Without a text layer probe (PyMuPDF missing/failed) every page is OCR'd
+            images = await run_in_ocr_executor(
+                render_pdf_pages_for_ocr, content, tmp_dir, ocr_pages if layer_texts else None
+            )
         except Exception as e:
-            parts.append(f"\n--- OCR Page {idx} ---\n[OCR_FAILED: {str(e)}]")
+            raise HTTPException(
+                status_code=500,
+                detail=(
+                    "Failed to render PDF pages for OCR. Install PyMuPDF, or pdf2image with Poppler on PATH. "
+                    f"Error: {str(e)}"
+                ),
+            )
+
+        results = await ocr_images_in_parallel_batches(pytesseract, images)
+
+    ocr_results = dict(zip(ocr_pages if layer_texts else range(len(results)), results))
+    parts: List[str] = []
+    for idx in range(1, max(len(layer_texts), len(results)) + 1):
+        if idx - 1 not in ocr_results:
+            parts.append(f"\n--- Page {idx} ---\n{layer_texts[idx - 1].strip()}")
+            continue
+        result = ocr_results[idx - 1]
+        if isinstance(result, BaseException):
+            parts.append(f"\n--- OCR Page {idx} ---\n[OCR_FAILED: {str(result)}]")
+            continue
+        txt = _WS_NEWLINE_RE.sub("\n", result or "")
+        txt = _MANY_NEWLINES_RE.sub("\n\n", txt).strip()
+        parts.append(f"\n--- OCR Page {idx} ---\n{txt}")
 
     return "\n".join(parts).strip()
 
+
+def probe_pdf_text_layer(content: bytes) -> List[str]:
+    """
+    Embedded text of each of the first OCR_MAX_PAGES pages (no rendering, so this is cheap).
+    Returns [] if PyMuPDF is unavailable or can't open the file.
+    """
+    try:
+        import fitz  # PyMuPDF
+
+        with fitz.open(stream=content, filetype="pdf") as doc:
+            return [
+                doc.load_page(page_num).get_text("text") or ""
+                for page_num in range(min(doc.page_count, max(1, OCR_MAX_PAGES)))
+            ]
+    except Exception as e:
+        print(f"PDF text layer probe unavailable: {e}")
+        return []
+
+
+def render_pdf_pages_for_ocr(content: bytes, out_dir: str, page_numbers: Optional[List[int]] = None) -> List[str]:
+    """
+    Rasterize the given 0-based pages (default: the first OCR_MAX_PAGES) to grayscale PNG files in
+    out_dir and return their paths, one page in memory at a time. PyMuPDF renders in-process;
+    pdf2image (Poppler subprocess) is only used when PyMuPDF is missing or can't open the file.
+    """
+    try:
+        import fitz  # PyMuPDF
+
+        paths = []
+        with fitz.open(stream=content, filetype="pdf") as doc:
+            if page_numbers is None:
+                page_numbers = list(range(min(doc.page_count, max(1, OCR_MAX_PAGES))))
+            for page_num in page_numbers:
+                # Grayscale is all Tesseract needs and is a third of the RGB size
+                pix = doc.load_page(page_num).get_pixmap(dpi=OCR_DPI, colorspace=fitz.csGRAY)
+                path = os.path.join(out_dir, f"page-{page_num + 1:04d}.png")
+                pix.save(path)
+                paths.append(path)
+        return paths
+    except Exception as e:
+        print(f"PyMuPDF render for OCR unavailable, falling back to pdf2image: {e}")
+
+    from pdf2image import convert_from_bytes  # type: ignore
+    render = partial(
+        convert_from_bytes, content, dpi=OCR_DPI, output_folder=out_dir, fmt="png",
+        grayscale=True, paths_only=True, thread_count=max(1, OCR_CONCURRENCY),
+    )
+    if page_numbers is None:
+        return render(first_page=1, last_page=max(1, OCR_MAX_PAGES))
+    paths = []
+    for page_num in page_numbers:
+        paths.extend(render(first_page=page_num + 1, last_page=page_num + 1))
+    return paths
+
+
+def ocr_images_batched(pytesseract, images: List[str]) -> Optional[List[str]]:
+    """
+    OCR all pages (image file paths) with a single Tesseract run so the engine/model is loaded
+    once, not per page. Tesseract accepts a text file listing image paths and separates pages
+    with a form feed. Returns None if the output can't be split back into one chunk per page.
+    """
+    with tempfile.TemporaryDirectory(prefix="ocr-") as tmp_dir:
+        list_path = os.path.join(tmp_dir, "pages.txt")
+        with open(list_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(images) + "\n")
+        text = pytesseract.image_to_string(list_path) or ""
+
+    pages = text.split("\x0c")
+    # Tesseract terminates every page with a form feed, leaving one empty trailing chunk.
+    if len(pages) == len(images) + 1 and not pages[-1].strip():
+        pages = pages[:-1]
+    if len(pages) != len(images):
+        return None
+    return pages
+
+
+async def ocr_images_concurrently(pytesseract, images: List[str]) -> List[Any]:
+    """
+    Per-page OCR on the OCR executor (Tesseract runs as a subprocess, so threads don't
+    contend on the GIL). Failed pages come back as exceptions.
+    """
+    return await asyncio.gather(
+        *(run_in_ocr_executor(pytesseract.image_to_string, img) for img in images),
+        return_exceptions=True,
+    )
+
+
+async def ocr_images_in_parallel_batches(pytesseract, images: List[str]) -> List[Any]:
+    """
+    Split the pages into up to OCR_CONCURRENCY contiguous groups (at most OCR_BATCH_MAX_PAGES
+    each) and OCR every group with one Tesseract run, all groups at once: each core gets its own
+    Tesseract process, and each process loads the model once rather than once per page.
+    A group whose batched output can't be split back per page is redone page by page.
+    Returns one text (or exception, for a failed page) per image, in order.
+    """
+    if len(images) <= 1:
+        return await ocr_images_concurrently(pytesseract, images)
+    group_size = min(-(-len(images) // max(1, OCR_CONCURRENCY)), max(1, OCR_BATCH_MAX_PAGES))
+    groups = [images[i:i + group_size] for i in range(0, len(images), group_size)]
+    batched = await asyncio.gather(
+        *(
+            run_in_ocr_executor(ocr_images_batched, pytesseract, group)
+            if len(group) > 1
+            else ocr_images_concurrently(pytesseract, group)
+            for group in groups
+        ),
+        return_exceptions=True,
+    )
+
+    results: List[Any] = []
+    for group, pages in zip(groups, batched):
+        if isinstance(pages, list):
+            results.extend(pages)
+            continue
+        if isinstance(pages, BaseException):
+            print(f"Batched OCR failed, falling back to per-page OCR: {pages}")
+        results.extend(await ocr_images_concurrently(pytesseract, group))
+    return results
+
+
+# Dedicated, bounded pool for OCR work. Keeps blocking render/Tesseract calls off the event
+# loop, and caps them at OCR_CONCURRENCY in total so one large scanned upload can't take over
+# the default executor that other requests' to_thread calls share.
+_ocr_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_ocr_executor() -> ThreadPoolExecutor:
+    global _ocr_executor
+    if _ocr_executor is None:
+        _ocr_executor = ThreadPoolExecutor(max_workers=max(1, OCR_CONCURRENCY), thread_name_prefix="ocr")
+    return _ocr_executor
+
+
+async def run_in_ocr_executor(func, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_ocr_executor(), partial(func, *args, **kwargs))
+
+
+def shutdown_ocr_executor() -> None:
+    global _ocr_executor
+    if _ocr_executor is not None:
+        _ocr_executor.shutdown(wait=False, cancel_futures=True)
+        _ocr_executor = None
+
 # Converter provider settings
 _provider_env = os.getenv("CONVERTER_PROVIDER")
 CONVERTER_PROVIDER = (_provider_env or "ollama").lower().strip()
@@ -162,6 +429,18 @@ CONVERTER_PROVIDER = (_provider_env or "ollama").lower().strip()
 # Ollama connection settings
 OLLAMA_HOST = os.getenv("OLLAMA_HOST", "http://127.0.0.1:11434").rstrip("/")
 PREFERRED_OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "vc-converter:latest")
+# How long Ollama keeps a model resident after a call (avoids reloading it between requests):
+# a duration like "60m"/"24h", or a number of seconds where -1 pins it until Ollama restarts
+_keep_alive_env = os.getenv("OLLAMA_KEEP_ALIVE", "60m").strip()
+OLLAMA_KEEP_ALIVE: Union[str, int] = (
+    int(_keep_alive_env) if re.fullmatch(r"-?\d+", _keep_alive_env) else _keep_alive_env
+)
+# Tries per Ollama chat call when the failure is transient (connection error, timeout, 429/5xx)
+OLLAMA_CHAT_ATTEMPTS = int(os.getenv("OLLAMA_CHAT_ATTEMPTS", "3"))
+# Pass the record JSON schema as Ollama's `format` (structured outputs, Ollama >= 0.5); false = plain JSON mode
+OLLAMA_STRUCTURED_OUTPUT = os.getenv("OLLAMA_STRUCTURED_OUTPUT", "true").lower() == "true"
+# Load/probe models in the background at startup so the first request doesn't pay for it
+PREWARM_MODELS = os.getenv("PREWARM_MODELS", "true").lower() == "true"
 
 # Anthropic (Claude) settings
 ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
@@ -185,6 +464,12 @@ ANTHROPIC_MODEL_FALLBACKS = [
     ] if m not in INVALID_MODELS
 ]
 
+# Model circuit breaker: skip a model that 404s as not_found for ANTHROPIC_MODEL_SKIP_SECONDS, and one
+# that fails transiently (429/5xx/stream error) for ANTHROPIC_MODEL_COOLDOWN_SECONDS, instead of
+# paying a round trip to it on every request.
+ANTHROPIC_MODEL_SKIP_SECONDS = float(os.getenv("ANTHROPIC_MODEL_SKIP_SECONDS", "300"))
+ANTHROPIC_MODEL_COOLDOWN_SECONDS = float(os.getenv("ANTHROPIC_MODEL_COOLDOWN_SECONDS", "30"))
+
 # Ask-the-fund settings (keep costs lean + fast)
 ASK_MAX_TOKENS = int(os.getenv("ASK_MAX_TOKENS", "400"))
 ASK_MAX_SOURCES = int(os.getenv("ASK_MAX_SOURCES", "3"))
@@ -200,10 +485,106 @@ OPENAI_EMBEDDING_MODEL = os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-3-s
 VOYAGE_API_KEY = os.getenv("VOYAGE_API_KEY")
 VOYAGE_EMBEDDING_MODEL = os.getenv("VOYAGE_EMBEDDING_MODEL", "voyage-3-lite")
 EMBEDDING_DIM = int(os.getenv("EMBEDDING_DIM", "1536"))
+# Memoize embeddings per (provider, model, input_type, text); EMBED_CACHE_DB persists them in sqlite
+EMBED_CACHE_MAX = int(os.getenv("EMBED_CACHE_MAX", "4096"))
+EMBED_CACHE_DB = os.getenv("EMBED_CACHE_DB")
+EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", "128"))  # texts per provider request (Voyage caps at 128)
+# Concurrent /embed/query calls arriving within this window share one provider request (0 disables)
+EMBED_COALESCE_MS = float(os.getenv("EMBED_COALESCE_MS", "5"))
+
+# Exact-match cache for /convert LLM results (byte-identical re-uploads skip embedding + inference)
+CONVERTER_CACHE_MAX = int(os.getenv("CONVERTER_CACHE_MAX", "2048"))
+CONVERTER_CACHE_DB = os.getenv("CONVERTER_CACHE_DB")  # optional sqlite path to survive restarts
+CONVERTER_CACHE_TTL_SECONDS = float(os.getenv("CONVERTER_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+# Model outputs (or CSV tables) with at least this many items/rows are normalized off the event loop
+NORMALIZE_THREAD_MIN_ITEMS = int(os.getenv("NORMALIZE_THREAD_MIN_ITEMS", "64"))
+# /convert/batch: conversions in flight at once (bounded by the provider's rate limits) and items per call
+CONVERT_BATCH_CONCURRENCY = max(1, int(os.getenv("CONVERT_BATCH_CONCURRENCY", "8")))
+CONVERT_BATCH_MAX_ITEMS = int(os.getenv("CONVERT_BATCH_MAX_ITEMS", "100"))
+# In-memory cache of text extracted from uploads, keyed by file hash (PDF/OCR extraction is the slow part)
+EXTRACTION_CACHE_MAX = int(os.getenv("EXTRACTION_CACHE_MAX", "64"))
+# In-memory cache of direct (no-LLM) table parses, so re-uploaded spreadsheets skip re-parsing
+DIRECT_PARSE_CACHE_MAX = int(os.getenv("DIRECT_PARSE_CACHE_MAX", "256"))
+
+# Semantic cache for /convert LLM results (opt-in: adds an Ollama embedding call per miss)
+SEMANTIC_CACHE_ENABLED = os.getenv("SEMANTIC_CACHE_ENABLED", "false").lower() == "true"
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.95"))  # tight: structural equivalence only
+SEMANTIC_CACHE_TTL_SECONDS = float(os.getenv("SEMANTIC_CACHE_TTL_SECONDS", "300"))
+SEMANTIC_CACHE_MAX = int(os.getenv("SEMANTIC_CACHE_MAX", "1000"))
 
 # Ingestion settings
 CLICKUP_API_TOKEN = os.getenv("CLICKUP_API_TOKEN")
 
+# Shared HTTP client pool settings (raise for high-concurrency deployments)
+HTTPX_MAX_CONNECTIONS = int(os.getenv("HTTPX_MAX_CONNECTIONS", "200"))
+HTTPX_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTPX_MAX_KEEPALIVE_CONNECTIONS", "100"))
+
+# Server settings for `python main.py` (Render sets PORT; an empty value falls through to the next)
+PORT = int(os.getenv("PORT") or os.getenv("OLLAMA_CONVERTER_PORT") or "8000")
+# Worker processes; each keeps its own in-memory caches, so scale out only when CPU-bound
+# (set CONVERTER_CACHE_DB / EMBED_CACHE_DB to share the caches between workers)
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY") or "1")
+
+# Module-level clients reuse TCP/TLS connections across requests instead of paying a
+# handshake per call. Created lazily (or at startup via lifespan) and closed on shutdown.
+_anthropic_http: Optional[httpx.AsyncClient] = None
+_ollama_http: Optional[httpx.AsyncClient] = None
+_external_http: Optional[httpx.AsyncClient] = None
+_ollama_client: Optional["ollama.AsyncClient"] = None
+
+
+def get_anthropic_http() -> httpx.AsyncClient:
+    """Shared HTTP/2 client for Anthropic (messages, streaming, vision)."""
+    global _anthropic_http
+    if _anthropic_http is None or _anthropic_http.is_closed:
+        _anthropic_http = httpx.AsyncClient(
+            timeout=60.0,
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=HTTPX_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTPX_MAX_KEEPALIVE_CONNECTIONS,
+            ),
+        )
+    return _anthropic_http
+
+
+def get_ollama_http() -> httpx.AsyncClient:
+    """Shared client for Ollama's HTTP API (short timeout: it's a local service)."""
+    global _ollama_http
+    if _ollama_http is None or _ollama_http.is_closed:
+        _ollama_http = httpx.AsyncClient(timeout=2.0, base_url=OLLAMA_HOST)
+    return _ollama_http
+
+
+def get_external_http() -> httpx.AsyncClient:
+    """Shared HTTP/2 client for third-party APIs (ClickUp, Google Drive, OpenAI/Voyage embeddings)."""
+    global _external_http
+    if _external_http is None or _external_http.is_closed:
+        _external_http = httpx.AsyncClient(
+            timeout=httpx.Timeout(30.0, connect=10.0),
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=HTTPX_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTPX_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=30.0,
+            ),
+        )
+    return _external_http
+
+
+async def close_http_clients() -> None:
+    global _anthropic_http, _ollama_http, _external_http, _ollama_client
+    for client in (_anthropic_http, _ollama_http, _external_http):
+        if client is not None and not client.is_closed:
+            await client.aclose()
+    # Older ollama clients have no close(); their pool is released with the process
+    if _ollama_client is not None and hasattr(_ollama_client, "close"):
+        await _ollama_client.close()
+    _anthropic_http = None
+    _ollama_http = None
+    _external_http = None
+    _ollama_client = None
+
 def get_anthropic_api_url() -> str:
     """
     Normalize Anthropic API URL.
@@ -225,42 +606,148 @@ def get_anthropic_api_url() -> str:
     return f"{base}/v1/messages"
 
 
+def get_anthropic_headers() -> Dict[str, str]:
+    """
+    Headers for Anthropic Messages API calls.
+    The prompt-caching beta header is harmless now that caching is GA, and keeps
+    older API versions/proxies honoring `cache_control` on system blocks.
+    """
+    return {
+        "Content-Type": "application/json",
+        "x-api-key": ANTHROPIC_API_KEY,
+        "anthropic-version": "2023-06-01",
+        "anthropic-beta": "prompt-caching-2024-07-31",
+    }
+
+
+def cached_system_block(text: str) -> List[Dict[str, Any]]:
+    """
+    Wrap a static system prompt so Anthropic caches it server-side (5 minute TTL,
+    refreshed on every hit). Only put content here that is identical across calls,
+    otherwise the cache key changes and every request is a miss.
+    """
+    return [{"type": "text", "text": text, "cache_control": {"type": "ephemeral"}}]
+
+
+@lru_cache(maxsize=8)
+def system_block_json(text: str) -> bytes:
+    """The system prompts are constants: serialize each cached system block once, not per request."""
+    return json_dumps(cached_system_block(text))
+
+
+def build_anthropic_body(model: str, prompt: str, system_text: str, max_tokens: int, temperature: float) -> bytes:
+    """
+    Streaming Messages request body, assembled from the pre-serialized system block plus
+    the per-request fields (only the user prompt needs real encoding).
+    """
+    return b"".join((
+        b'{"model":', json_dumps(model),
+        b',"max_tokens":', str(int(max_tokens)).encode(),
+        b',"temperature":', json_dumps(temperature),
+        b',"stream":true,"system":', system_block_json(system_text),
+        b',"messages":[{"role":"user","content":', json_dumps(prompt), b'}]}',
+    ))
+
+
+# Installed Ollama models rarely change; reuse the last non-empty listing for a short while
+OLLAMA_MODELS_CACHE_TTL_SECONDS = float(os.getenv("OLLAMA_MODELS_CACHE_TTL_SECONDS", "60"))
+_ollama_models_cache: Tuple[float, List[str]] = (0.0, [])
+_ollama_models_lock = asyncio.Lock()
+
+
 async def fetch_ollama_model_names() -> List[str]:
     """
     More reliable than python ollama.list() on some setups.
     Uses Ollama's HTTP API to list installed models.
+    Cached for OLLAMA_MODELS_CACHE_TTL_SECONDS; empty results (Ollama down) are not cached.
     """
-    names: List[str] = []
+    global _ollama_models_cache
+    fetched_at, cached_names = _ollama_models_cache
+    if cached_names and time.monotonic() - fetched_at < OLLAMA_MODELS_CACHE_TTL_SECONDS:
+        return list(cached_names)
 
-    # First, try the HTTP /api/tags endpoint
-    try:
-        async with httpx.AsyncClient(timeout=2.0) as client:
-            res = await client.get(f"{OLLAMA_HOST}/api/tags")
+    # One refresh at a time: requests arriving while the listing is stale wait for it instead of
+    # each sending their own /api/tags (and list() fallback) to Ollama
+    async with _ollama_models_lock:
+        fetched_at, cached_names = _ollama_models_cache
+        if cached_names and time.monotonic() - fetched_at < OLLAMA_MODELS_CACHE_TTL_SECONDS:
+            return list(cached_names)
+
+        names: List[str] = []
+
+        # First, try the HTTP /api/tags endpoint
+        try:
+            res = await get_ollama_http().get("/api/tags")
             res.raise_for_status()
-            data = res.json() or {}
+            data = json_loads(res.content) or {}
             models = data.get("models", []) or []
             for m in models:
                 if isinstance(m, dict) and m.get("name"):
                     names.append(m["name"])
-    except Exception:
-        # swallow and try python client fallback below
-        names = []
+        except Exception:
+            # swallow and try python client fallback below
+            names = []
 
-    # Fallback: python client list() if HTTP returned nothing
-    if not names:
-        try:
-            client = get_ollama_client()
-            models = client.list()
-            if isinstance(models, dict):
-                for m in models.get("models", []) or []:
-                    if isinstance(m, dict) and m.get("name"):
-                        names.append(m["name"])
-                    elif isinstance(m, str):
+        # Fallback: python client list() if HTTP returned nothing
+        if not names:
+            try:
+                models = await get_ollama_client().list()
+                # Newer clients return response models (with .get) whose entries use "model", not "name"
+                for m in (models.get("models", []) if hasattr(models, "get") else []) or []:
+                    if isinstance(m, str):
                         names.append(m)
-        except Exception:
-            pass
+                    elif hasattr(m, "get") and (m.get("name") or m.get("model")):
+                        names.append(m.get("name") or m.get("model"))
+            except Exception:
+                pass
+
+        if names:
+            _ollama_models_cache = (time.monotonic(), names)
+        return list(names)
+
+
+def is_transient_ollama_error(error: Exception) -> bool:
+    """Connection drops, timeouts and overload responses are worth retrying; model/prompt errors are not."""
+    if isinstance(error, (httpx.TimeoutException, httpx.TransportError, ConnectionError)):
+        return True
+    return isinstance(error, ollama.ResponseError) and getattr(error, "status_code", None) in (429, 502, 503, 504)
+
+
+async def ollama_chat_with_retry(client: "ollama.AsyncClient", **kwargs: Any) -> Any:
+    """client.chat with jittered exponential backoff on transient errors, up to OLLAMA_CHAT_ATTEMPTS tries."""
+    attempts = max(1, OLLAMA_CHAT_ATTEMPTS)
+    for attempt in range(1, attempts + 1):
+        try:
+            return await client.chat(**kwargs)
+        except Exception as e:
+            if attempt == attempts or not is_transient_ollama_error(e):
+                raise
+            delay = min(8.0, 0.5 * 2 ** (attempt - 1)) * random.uniform(0.5, 1.0)
+            print(f"Ollama chat attempt {attempt}/{attempts} failed ({type(e).__name__}: {e}); retrying in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+
+def forget_missing_ollama_model(error: Exception) -> None:
+    """Drop the cached model listing when Ollama reports the model gone, so the next call re-lists."""
+    global _ollama_models_cache
+    if getattr(error, "status_code", None) == 404 or "not found" in str(error).lower():
+        _ollama_models_cache = (0.0, [])
+
 
-    return names
+async def resolve_ollama_model() -> str:
+    """
+    Model to convert with: the (cached) installed-model listing run through pick_model.
+    Raises 503 when Ollama lists nothing.
+    """
+    # Check models via HTTP API (more reliable than python ollama.list on some setups);
+    # fetch_ollama_model_names already falls back to the python client
+    available_models = await fetch_ollama_model_names()
+    if not available_models:
+        raise HTTPException(
+            status_code=503,
+            detail=f"No Ollama models available at {OLLAMA_HOST}. Run: ollama pull llama3.1"
+        )
+    return pick_model(available_models)
 
 
 def pick_model(available_models: List[str]) -> str:
@@ -268,6 +755,12 @@ def pick_model(available_models: List[str]) -> str:
     Pick a model name to use for conversion.
     Prefer env OLLAMA_MODEL, then vc-converter*, then llama3.1*, then llama3.2*, else first.
     """
+    return _pick_model(tuple(available_models))
+
+
+@lru_cache(maxsize=8)
+def _pick_model(available_models: Tuple[str, ...]) -> str:
+    # The preference env vars are fixed at startup, so the choice only depends on the listing.
     if not available_models:
         return PREFERRED_OLLAMA_MODEL
 
@@ -282,9 +775,69 @@ def pick_model(available_models: List[str]) -> str:
     return available_models[0]
 
 
-def get_ollama_client() -> "ollama.Client":
-    # Force the host so the python client matches what `ollama list` uses.
-    return ollama.Client(host=OLLAMA_HOST)
+def get_ollama_client() -> "ollama.AsyncClient":
+    """
+    Shared async Ollama client: calls are awaited, so a long generation no longer blocks the
+    event loop (and every other request) the way the sync client did.
+    """
+    global _ollama_client
+    if _ollama_client is None:
+        # Force the host so the python client matches what `ollama list` uses.
+        _ollama_client = ollama.AsyncClient(host=OLLAMA_HOST)
+    return _ollama_client
+
+async def probe_anthropic_models() -> None:
+    """
+    One-token request per fallback model until one answers, so models that don't exist on
+    this account are already tripped in the circuit breaker before the first real request.
+    """
+    client = get_anthropic_http()
+    headers = get_anthropic_headers()
+    url = get_anthropic_api_url()
+    for model_name in anthropic_models_to_try(ANTHROPIC_MODEL_FALLBACKS):
+        body = json_dumps({
+            "model": model_name,
+            "max_tokens": 1,
+            "messages": [{"role": "user", "content": "ping"}],
+        })
+        res = await client.post(url, headers=headers, content=body)
+        if res.status_code == 404 and is_model_not_found(res):
+            mark_anthropic_model_failed(model_name, not_found=True)
+            continue
+        if res.status_code < 400:
+            mark_anthropic_model_ok(model_name)
+            print(f"Anthropic model available: {model_name}")
+        return
+
+
+async def prewarm_models() -> None:
+    """Best-effort startup warm-up of whichever models this deployment uses. Never raises."""
+    use_claude = ANTHROPIC_API_KEY is not None and ANTHROPIC_API_KEY.strip() != ""
+    if CONVERTER_PROVIDER == "claude" or use_claude:
+        try:
+            await probe_anthropic_models()
+        except Exception as e:
+            print(f"Anthropic model probe skipped: {e}")
+    else:
+        try:
+            model_name = pick_model(await fetch_ollama_model_names())
+            # A 1-token generation forces Ollama to load the weights; keep_alive pins them.
+            await get_ollama_client().generate(
+                model=model_name,
+                prompt=" ",
+                options={"num_predict": 1},
+                keep_alive=OLLAMA_KEEP_ALIVE,
+            )
+            print(f"Pre-warmed Ollama model: {model_name}")
+        except Exception as e:
+            print(f"Ollama pre-warm skipped: {e}")
+
+    if EMBEDDINGS_PROVIDER == "ollama" or SEMANTIC_CACHE_ENABLED:
+        try:
+            await get_ollama_client().embed(model=OLLAMA_EMBEDDING_MODEL, input=" ", keep_alive=OLLAMA_KEEP_ALIVE)
+            print(f"Pre-warmed Ollama embedding model: {OLLAMA_EMBEDDING_MODEL}")
+        except Exception as e:
+            print(f"Ollama embedding pre-warm skipped: {e}")
 
 # CORS middleware to allow frontend requests
 _cors_origins_env = os.getenv("CORS_ALLOW_ORIGINS", "*")
@@ -303,7 +856,13 @@ app.add_middleware(
 )
 
 # Data models
+# Records are frozen: cached conversion results hand out shallow copies that share record
+# instances, so in-place edits would leak into the cache (use model_copy(update=...)).
+RECORD_MODEL_CONFIG = ConfigDict(frozen=True)
+
 class StartupData(BaseModel):
+    model_config = RECORD_MODEL_CONFIG
+
     companyName: str
     geoMarkets: List[str]
     industry: str
@@ -312,6 +871,8 @@ class StartupData(BaseModel):
     availabilityStatus: str = "present"
 
 class InvestorData(BaseModel):
+    model_config = RECORD_MODEL_CONFIG
+
     firmName: str
     memberName: str
     geoFocus: List[str]
@@ -324,6 +885,8 @@ class InvestorData(BaseModel):
     availabilityStatus: str = "present"
 
 class MentorData(BaseModel):
+    model_config = RECORD_MODEL_CONFIG
+
     fullName: str
     email: str
     linkedinUrl: Optional[str] = None
@@ -334,6 +897,8 @@ class MentorData(BaseModel):
     availabilityStatus: str = "present"
 
 class CorporateData(BaseModel):
+    model_config = RECORD_MODEL_CONFIG
+
     firmName: str
     contactName: str
     email: Optional[str] = None
@@ -348,6 +913,7 @@ class ConversionRequest(BaseModel):
     data: str  # Unstructured data (text, CSV, JSON, etc.)
     dataType: Optional[str] = None  # 'startup', 'investor', or None for auto-detect
     format: Optional[str] = None  # 'csv', 'text', 'json', etc.
+    no_cache: bool = False  # Skip conversion caches (always call the model)
 
 class ConversionResponse(BaseModel):
     startups: List[StartupData] = []
@@ -360,6 +926,32 @@ class ConversionResponse(BaseModel):
     errors: List[str] = []
     raw_content: Optional[str] = None
 
+class ConversionBatchRequest(BaseModel):
+    items: List[ConversionRequest]
+
+class ConversionBatchResponse(BaseModel):
+    results: List[ConversionResponse]  # same order as the request items
+
+def _record_schema(model_cls: Any) -> Dict[str, Any]:
+    """JSON schema of one record as the model should emit it (availabilityStatus is ours to set)."""
+    schema = model_cls.model_json_schema()
+    schema.pop("title", None)
+    schema["properties"].pop("availabilityStatus", None)
+    return schema
+
+
+# Ollama structured-output schema: the four record buckets the converter reads back
+CONVERSION_OUTPUT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "startups": {"type": "array", "items": _record_schema(StartupData)},
+        "investors": {"type": "array", "items": _record_schema(InvestorData)},
+        "mentors": {"type": "array", "items": _record_schema(MentorData)},
+        "corporates": {"type": "array", "items": _record_schema(CorporateData)},
+    },
+    "required": ["startups", "investors", "mentors", "corporates"],
+}
+
 class FileValidationResponse(BaseModel):
     isValid: bool
     errors: List[str] = []
@@ -404,6 +996,13 @@ class EmbedRequest(BaseModel):
 class EmbedResponse(BaseModel):
     embedding: List[float]
 
+class EmbedBatchRequest(BaseModel):
+    texts: List[str]
+    input_type: Optional[str] = None
+
+class EmbedBatchResponse(BaseModel):
+    embeddings: List[List[float]]
+
 class ClickUpListsResponse(BaseModel):
     lists: List[Dict[str, Any]] = []
 
@@ -470,12 +1069,52 @@ IMPORTANT RULES:
 
 Return ONLY the JSON object or array, nothing else."""
 
-def create_conversion_prompt(data: str, data_type: Optional[str] = None) -> str:
-    """Create a prompt for Ollama to convert unstructured data"""
-    # Keep prompt/model input bounded to reduce truncation.
+# Shared, never-mutated system message for Ollama chats; only the user message is built per call
+SYSTEM_MESSAGE = {"role": "system", "content": SYSTEM_PROMPT}
+
+def trim_model_input(data: str) -> str:
+    """Keep prompt/model input bounded to reduce truncation."""
     trimmed = data if len(data) <= MAX_MODEL_INPUT_CHARS else data[:MAX_MODEL_INPUT_CHARS]
     if len(trimmed) != len(data):
         trimmed = trimmed + "\n\n[TRUNCATED INPUT: content was longer than MAX_MODEL_INPUT_CHARS]"
+    return trimmed
+
+def split_model_input(data: str) -> Tuple[List[str], bool]:
+    """
+    Split input longer than MAX_MODEL_INPUT_CHARS into overlapping chunks, cutting at line breaks
+    where possible so CSV rows and paragraphs stay whole. Tabular input repeats its header line at
+    the top of every later chunk so the model still sees the column names. Returns (chunks, truncated).
+    """
+    if len(data) <= MAX_MODEL_INPUT_CHARS:
+        return [data], False
+    size = MAX_MODEL_INPUT_CHARS
+    overlap = min(MODEL_INPUT_CHUNK_OVERLAP, size // 4)
+    header = ""
+    if detect_structured_csv(data) is not None:
+        header_end = data.find("\n") + 1
+        if 0 < header_end <= size // 4:
+            header = data[:header_end]
+    chunks: List[str] = []
+    start = 0
+    while len(chunks) < MAX_MODEL_INPUT_CHUNKS:
+        prefix = header if start else ""
+        budget = size - len(prefix)
+        end = start + budget
+        if end >= len(data):
+            chunks.append(prefix + data[start:])
+            return chunks, False
+        newline = data.rfind("\n", start + budget // 2, end)
+        if newline != -1:
+            end = newline + 1
+        chunks.append(prefix + data[start:end])
+        # Start the next chunk on the first whole line inside the overlap, never mid-row
+        newline = data.find("\n", end - overlap, end)
+        start = newline + 1 if newline != -1 else end - overlap
+    return chunks, True
+
+def create_conversion_prompt(data: str, data_type: Optional[str] = None) -> str:
+    """Create a prompt for Ollama to convert unstructured data"""
+    trimmed = trim_model_input(data)
     if data_type:
         prompt = (
             f"Extract {data_type} information from the following data and convert to JSON format.\n"
@@ -489,69 +1128,40 @@ def create_conversion_prompt(data: str, data_type: Optional[str] = None) -> str:
         )
     return prompt
 
+# Stateless, so one decoder serves every call (raw_decode locates embedded JSON blocks)
+_JSON_DECODER = json.JSONDecoder()
+
+
 def parse_ollama_response(response: str) -> Dict[str, Any]:
     """Parse model response and extract JSON"""
     # Remove markdown code blocks if present
-    response = re.sub(r'```json\n?', '', response)
-    response = re.sub(r'```\n?', '', response)
+    response = _JSON_FENCE_RE.sub('', response)
     response = response.strip()
 
-    def extract_first_json_block(text: str) -> Optional[str]:
-        """
-        Extract the first complete JSON object/array from text using bracket balancing.
-        This is robust against extra prose before/after JSON and avoids greedy regex traps.
-        """
-        start_idx = None
-        stack: List[str] = []
-        in_string = False
-        escape = False
-
-        for i, ch in enumerate(text):
-            if start_idx is None:
-                if ch == '{':
-                    start_idx = i
-                    stack = ['}']
-                elif ch == '[':
-                    start_idx = i
-                    stack = [']']
-                continue
-
-            # We are inside a candidate JSON block
-            if in_string:
-                if escape:
-                    escape = False
-                elif ch == '\\':
-                    escape = True
-                elif ch == '"':
-                    in_string = False
-                continue
-
-            if ch == '"':
-                in_string = True
-                continue
-
-            if ch == '{':
-                stack.append('}')
-            elif ch == '[':
-                stack.append(']')
-            elif ch in ('}', ']'):
-                if stack and ch == stack[-1]:
-                    stack.pop()
-                    if not stack and start_idx is not None:
-                        return text[start_idx:i + 1]
-                else:
-                    # Mismatched closing bracket; keep scanning but this block is likely invalid.
-                    pass
-
-        return None
-
-    # First try: extract a complete JSON block from within the response
-    block = extract_first_json_block(response)
-    if block:
+    # Fast path: JSON mode usually returns a bare document
+    try:
+        return orjson.loads(response)
+    except orjson.JSONDecodeError:
+        pass
+
+    # Otherwise find the first complete JSON object/array embedded in prose. raw_decode parses
+    # in C and reports where the value ends, so extra text before/after the JSON is fine.
+    pos = 0
+    while True:
+        obj_start = response.find('{', pos)
+        arr_start = response.find('[', pos)
+        start = obj_start if arr_start == -1 or -1 < obj_start < arr_start else arr_start
+        if start == -1:
+            break
         try:
-            return json.loads(block)
-        except json.JSONDecodeError:
-            pass
+            obj, _end = _JSON_DECODER.raw_decode(response, start)
+            return obj
+        except json.JSONDecodeError as e:
+            # Truncated output: nothing later can be a complete top-level block
+            if e.pos >= len(response) or e.msg.startswith("Unterminated string"):
+                break
+            # Don't retry inside the span that already failed (it would yield a fragment)
+            pos = max(start + 1, e.pos)
 
     # Fallback: try parsing the whole response as JSON
     try:
@@ -564,12 +1174,86 @@ def parse_ollama_response(response: str) -> Dict[str, Any]:
 
 def is_model_not_found(response: httpx.Response) -> bool:
     try:
-        data = response.json() or {}
+        data = json_loads(response.content) or {}
         err = data.get("error") or {}
         return err.get("type") == "not_found_error" and "model" in str(err.get("message", "")).lower()
     except Exception:
         return False
 
+_anthropic_model_skip_until: Dict[str, float] = {}
+
+def anthropic_models_to_try(models: List[str]) -> List[str]:
+    """De-duplicated fallback order minus models currently tripped (all of them if every model is tripped)."""
+    ordered = list(dict.fromkeys(m for m in models if m))
+    now = time.monotonic()
+    available = [m for m in ordered if _anthropic_model_skip_until.get(m, 0.0) <= now]
+    return available or ordered
+
+def mark_anthropic_model_failed(model: str, not_found: bool = False) -> None:
+    skip_seconds = ANTHROPIC_MODEL_SKIP_SECONDS if not_found else ANTHROPIC_MODEL_COOLDOWN_SECONDS
+    _anthropic_model_skip_until[model] = time.monotonic() + skip_seconds
+
+def mark_anthropic_model_ok(model: str) -> None:
+    _anthropic_model_skip_until.pop(model, None)
+
+def is_transient_anthropic_status(status_code: int) -> bool:
+    """Rate limits, overload (529) and server errors trip the breaker; other 4xx are request/config problems."""
+    return status_code == 429 or status_code >= 500
+
+def is_transient_anthropic_failure(error: Exception) -> bool:
+    """Transport errors and overloaded/truncated streams trip the breaker; a rejected request doesn't."""
+    if isinstance(error, httpx.HTTPStatusError):
+        return is_transient_anthropic_status(error.response.status_code)
+    return isinstance(error, httpx.HTTPError) or getattr(error, "transient", False)
+
+class ClaudeStreamError(ValueError):
+    """A Claude stream that failed after a 200 response; `transient` marks overload and early ends."""
+
+    def __init__(self, message: str, transient: bool = False):
+        super().__init__(message)
+        self.transient = transient
+
+async def post_anthropic_streaming(
+    client: httpx.AsyncClient, url: str, headers: Dict[str, str], body: bytes
+) -> Tuple[httpx.Response, str]:
+    """
+    POST a Messages request body built with stream=True and accumulate the text deltas.
+    The read timeout then applies between events rather than to the whole generation.
+    Error responses are read fully and returned with empty text, so callers can inspect
+    status/body exactly as with client.post. Raises ClaudeStreamError (a ValueError) on an
+    in-stream error event or when the stream ends before message_stop (the text would be
+    truncated); transport errors (httpx.HTTPError) propagate.
+    """
+    async with client.stream("POST", url, headers=headers, content=body) as res:
+        if res.status_code >= 400:
+            await res.aread()
+            return res, ""
+        buf = StringIO()
+        stopped = False
+        async for line in res.aiter_lines():
+            if not line.startswith("data: "):
+                continue
+            try:
+                event = json_loads(line[6:])
+            except ValueError:
+                continue
+            event_type = event.get("type")
+            if event_type == "content_block_delta":
+                delta = event.get("delta") or {}
+                if delta.get("type") == "text_delta":
+                    buf.write(delta.get("text") or "")
+            elif event_type == "error":
+                error = event.get("error") or {}
+                raise ClaudeStreamError(
+                    f"Claude stream error: {error}", transient=error.get("type") == "overloaded_error"
+                )
+            elif event_type == "message_stop":
+                stopped = True
+                break
+        if not stopped:
+            raise ClaudeStreamError("Claude stream ended early", transient=True)
+        return res, buf.getvalue()
+
 async def call_anthropic(prompt: str) -> str:
     """
     Call Anthropic (Claude) API and return the raw text response.
@@ -581,55 +1265,51 @@ async def call_anthropic(prompt: str) -> str:
             detail="ANTHROPIC_API_KEY not set. Set it in the server environment to use Claude."
         )
 
-    headers = {
-        "Content-Type": "application/json",
-        "x-api-key": ANTHROPIC_API_KEY,
-        "anthropic-version": "2023-06-01",
-    }
+    headers = get_anthropic_headers()
     url = get_anthropic_api_url()
     default_url = "https://api.anthropic.com/v1/messages"
 
     last_error: Optional[str] = None
-    async with httpx.AsyncClient(timeout=60.0) as client:
-        for model_name in [m for m in ANTHROPIC_MODEL_FALLBACKS if m]:
-            payload = {
-                "model": model_name,
-                "max_tokens": 4096,
-                "temperature": 0.1,
-                "system": SYSTEM_PROMPT,
-                "messages": [
-                    {"role": "user", "content": prompt}
-                ],
-            }
+    client = get_anthropic_http()
+    for model_name in anthropic_models_to_try(ANTHROPIC_MODEL_FALLBACKS):
+        body = build_anthropic_body(model_name, prompt, SYSTEM_PROMPT, max_tokens=4096, temperature=0.1)
 
-            res = await client.post(url, headers=headers, json=payload)
+        try:
+            res, text = await post_anthropic_streaming(client, url, headers, body)
             # If a misconfigured URL causes 404, retry with the canonical endpoint.
             if res.status_code == 404 and url != default_url:
-                res = await client.post(default_url, headers=headers, json=payload)
-            if res.status_code == 404 and is_model_not_found(res):
-                last_error = f"Model not found: {model_name}"
-                continue
-            if res.status_code == 404:
-                body = res.text[:400].strip()
-                raise HTTPException(
-                    status_code=502,
-                    detail=(
-                        f"Claude API 404 at {url}. Check ANTHROPIC_API_URL and account access. "
-                        f"Response: {body or 'empty'}"
-                    ),
-                )
-            try:
-                res.raise_for_status()
-            except httpx.HTTPError as e:
-                last_error = str(e)
-                continue
-
-            data = res.json()
-            content = data.get("content", [])
-            if not content or not isinstance(content, list) or "text" not in content[0]:
-                last_error = "Claude returned empty content."
-                continue
-            return content[0]["text"]
+                res, text = await post_anthropic_streaming(client, default_url, headers, body)
+        except (ValueError, httpx.HTTPError) as e:
+            last_error = str(e) or type(e).__name__
+            if is_transient_anthropic_failure(e):
+                mark_anthropic_model_failed(model_name)
+            continue
+        if res.status_code == 404 and is_model_not_found(res):
+            last_error = f"Model not found: {model_name}"
+            mark_anthropic_model_failed(model_name, not_found=True)
+            continue
+        if res.status_code == 404:
+            body = res.text[:400].strip()
+            raise HTTPException(
+                status_code=502,
+                detail=(
+                    f"Claude API 404 at {url}. Check ANTHROPIC_API_URL and account access. "
+                    f"Response: {body or 'empty'}"
+                ),
+            )
+        try:
+            res.raise_for_status()
+        except httpx.HTTPError as e:
+            last_error = str(e)
+            if is_transient_anthropic_failure(e):
+                mark_anthropic_model_failed(model_name)
+            continue
+
+        if not text:
+            last_error = "Claude returned empty content."
+            continue
+        mark_anthropic_model_ok(model_name)
+        return text
 
     raise HTTPException(
         status_code=502,
@@ -685,31 +1365,31 @@ def build_answer_prompt(question: str, sources: List[AskSource], decisions: List
     sources_block = "\n\n".join(source_lines) if source_lines else "No sources available."
     decisions_block = "\n".join(decision_lines) if decision_lines else "No decision history available."
     
-    is_meta = is_meta_question(question)
-    
-    if is_meta:
-        # Meta questions: answer with general knowledge about Orbit AI capabilities
-        return f"""You are Orbit AI, a VC intelligence system built for investment teams. Answer this question about your capabilities and features.
-
-Question:
+    if is_meta_question(question):
+        # Meta questions: the capability description lives in ASK_META_SYSTEM_PROMPT
+        return f"""Question:
 {question}
-
-Answer based on what Orbit AI can do:
-- Answer questions about uploaded documents (pitch decks, memos, meeting notes)
-- Extract structured information from unstructured documents
-- Track investment decisions and outcomes
-- Provide insights from your fund's knowledge base
-- Search across all uploaded sources semantically
-- Help with due diligence by finding relevant information quickly
-
-Be helpful and specific. Explain what you can do and how you help investment teams.
 """
-    else:
-        # Document questions: use sources only
-        return f"""You are Orbit AI, a VC intelligence system. You answer questions STRICTLY from the provided sources only.
+    # Document questions: rules live in ASK_SYSTEM_PROMPT; only the dynamic parts go here
+    return f"""Question:
+{question}
+
+Sources:
+{sources_block}
+
+Decision history (optional context):
+{decisions_block}
+
+Remember: If the answer isn't in the sources above, you MUST say you don't have that information. Never make up answers.
+"""
+
+
+# Static system prompts for /ask. Kept byte-identical across calls so Anthropic's prompt cache can hit;
+# anything per-request (question, sources, decisions) belongs in build_answer_prompt instead.
+ASK_SYSTEM_PROMPT = """You are Orbit AI, a VC intelligence system. You answer questions STRICTLY from the provided sources only.
 
 CRITICAL RULES:
-1. ONLY use information from the sources below. Do NOT use general knowledge.
+1. ONLY use information from the sources in the user message. Do NOT use general knowledge.
 2. The sources provided may NOT be relevant to the question. You MUST verify relevance before answering.
 3. If the sources DO contain relevant details that DIRECTLY answer the question, provide a thorough, well-structured answer using those details.
 4. If the sources do NOT contain relevant information about the question topic, you MUST say EXACTLY: "I don't have information about this in the provided sources. Please upload relevant documents or try a different question."
@@ -720,19 +1400,24 @@ CRITICAL RULES:
 
 Answer style:
 - Use bullet points for responsibilities, qualifications, and scope.
-- Prefer completeness over brevity when sources list multiple items.
+- Prefer completeness over brevity when sources list multiple items."""
 
-Question:
-{question}
+ASK_META_SYSTEM_PROMPT = """You are Orbit AI, a VC intelligence system built for investment teams. Answer the user's question about your capabilities and features.
 
-Sources:
-{sources_block}
+Answer based on what Orbit AI can do:
+- Answer questions about uploaded documents (pitch decks, memos, meeting notes)
+- Extract structured information from unstructured documents
+- Track investment decisions and outcomes
+- Provide insights from your fund's knowledge base
+- Search across all uploaded sources semantically
+- Help with due diligence by finding relevant information quickly
 
-Decision history (optional context):
-{decisions_block}
+Be helpful and specific. Explain what you can do and how you help investment teams."""
 
-Remember: If the answer isn't in the sources above, you MUST say you don't have that information. Never make up answers.
-"""
+
+def get_answer_system_prompt(question: str) -> str:
+    """Pick the static (cacheable) system prompt matching build_answer_prompt's question type."""
+    return ASK_META_SYSTEM_PROMPT if is_meta_question(question) else ASK_SYSTEM_PROMPT
 
 # Fast model for simple questions (3-5x faster)
 HAIKU_MODEL = "claude-3-5-haiku-20241022"
@@ -774,13 +1459,10 @@ async def call_anthropic_answer(prompt: str, question: str = "", sources: List[A
             detail="ANTHROPIC_API_KEY not set. Set it in the server environment to use Claude."
         )
 
-    headers = {
-        "Content-Type": "application/json",
-        "x-api-key": ANTHROPIC_API_KEY,
-        "anthropic-version": "2023-06-01",
-    }
+    headers = get_anthropic_headers()
     url = get_anthropic_api_url()
     default_url = "https://api.anthropic.com/v1/messages"
+    system_prompt = get_answer_system_prompt(question)
 
     # Choose model based on question complexity (Haiku is 3-5x faster)
     use_haiku = question and sources and is_simple_question(question, sources)
@@ -789,208 +1471,222 @@ async def call_anthropic_answer(prompt: str, question: str = "", sources: List[A
     max_tokens = 250 if use_haiku else ASK_MAX_TOKENS
     
     last_error: Optional[str] = None
-    async with httpx.AsyncClient(timeout=60.0) as client:
-        for model_name in [m for m in model_list if m]:
-            payload = {
-                "model": model_name,
-                "max_tokens": max_tokens,
-                "temperature": 0.1,
-                "system": "You are Orbit AI, a VC intelligence system. You answer questions STRICTLY from provided sources only. Never use general knowledge. If information isn't in the sources, say so explicitly. Always cite sources with [1], [2], etc.",
-                "messages": [
-                    {"role": "user", "content": prompt}
-                ],
-            }
+    client = get_anthropic_http()
+    for model_name in anthropic_models_to_try(model_list):
+        body = build_anthropic_body(model_name, prompt, system_prompt, max_tokens=max_tokens, temperature=0.1)
 
-            res = await client.post(url, headers=headers, json=payload)
+        try:
+            res, text = await post_anthropic_streaming(client, url, headers, body)
             if res.status_code == 404 and url != default_url:
-                res = await client.post(default_url, headers=headers, json=payload)
-            if res.status_code == 404 and is_model_not_found(res):
-                last_error = f"Model not found: {model_name}"
-                continue
-            if res.status_code >= 400:
-                body = res.text[:400].strip()
-                raise HTTPException(
-                    status_code=502,
-                    detail=f"Claude API error ({res.status_code}): {body or 'empty response'}",
-                )
+                res, text = await post_anthropic_streaming(client, default_url, headers, body)
+        except (ValueError, httpx.HTTPError) as e:
+            last_error = str(e) or type(e).__name__
+            if is_transient_anthropic_failure(e):
+                mark_anthropic_model_failed(model_name)
+            continue
+        if res.status_code == 404 and is_model_not_found(res):
+            last_error = f"Model not found: {model_name}"
+            mark_anthropic_model_failed(model_name, not_found=True)
+            continue
+        if res.status_code >= 400:
+            if is_transient_anthropic_status(res.status_code):
+                mark_anthropic_model_failed(model_name)
+            body = res.text[:400].strip()
+            raise HTTPException(
+                status_code=502,
+                detail=f"Claude API error ({res.status_code}): {body or 'empty response'}",
+            )
 
-            data = res.json() or {}
-            content = data.get("content") or []
-            text = ""
-            if isinstance(content, list) and content:
-                text = content[0].get("text") or ""
-            elif isinstance(content, str):
-                text = content
-            if not text:
-                raise HTTPException(status_code=502, detail="Claude returned empty content.")
-            return text.strip()
+        if not text:
+            raise HTTPException(status_code=502, detail="Claude returned empty content.")
+        mark_anthropic_model_ok(model_name)
+        return text.strip()
 
     raise HTTPException(status_code=503, detail=last_error or "No Claude model available.")
 
-def normalize_startup_data(data: Dict[str, Any]) -> StartupData:
-    """Normalize extracted startup data to match schema"""
-    def safe_str(val: Any) -> str:
-        return val.strip() if isinstance(val, str) else (str(val).strip() if val is not None else "")
-    def safe_int(val: Any, default: int = 0) -> int:
-        try:
-            if val is None:
-                return default
-            if isinstance(val, (int, float)):
-                return int(val)
-            if isinstance(val, str):
-                cleaned = re.sub(r'[^\d.]', '', val)
-                return int(float(cleaned)) if cleaned else default
-            return default
-        except Exception:
+def safe_str(val: Any) -> str:
+    return val.strip() if isinstance(val, str) else (str(val).strip() if val is not None else "")
+
+def safe_int(val: Any, default: int = 0) -> int:
+    try:
+        if val is None:
             return default
+        if isinstance(val, (int, float)):
+            return int(val)
+        if isinstance(val, str):
+            # Plain digit strings (most CSV cells) don't need the regex clean-up
+            if val.isdecimal():
+                return int(val)
+            cleaned = _DIGITS_RE.sub('', val)
+            return int(float(cleaned)) if cleaned else default
+        return default
+    except Exception:
+        return default
+
+@lru_cache(maxsize=4096)
+def _split_list_cell(value: str) -> Tuple[str, ...]:
+    # Tag/industry/geo cells repeat heavily across rows; a tuple can be shared safely between callers
+    return tuple(item.strip() for item in _LIST_SPLIT_RE.split(value) if item.strip())
+
+def parse_list(value: Any) -> List[Any]:
+    """Split a "a, b; c | d" cell into items; lists pass through unchanged."""
+    if isinstance(value, list):
+        return value
+    if isinstance(value, str):
+        return list(_split_list_cell(value))
+    return []
+
+def first_present(data: Dict[str, Any], keys: Tuple[str, ...], default: Any = None) -> Any:
+    """First truthy value among alias keys (same semantics as a `data.get(a) or data.get(b) or ...` chain)."""
+    for key in keys:
+        value = data.get(key)
+        if value:
+            return value
+    return default
+
+def first_key(data: Dict[str, Any], keys: Tuple[str, ...], default: Any = None) -> Any:
+    """Value of the first alias key that exists at all, even if falsy (like nested `data.get(a, data.get(b, ...))`)."""
+    for key in keys:
+        if key in data:
+            return data[key]
+    return default
+
+# Startup field aliases, in priority order
+_STARTUP_NAME_KEYS = ('companyName', 'company_name', 'name')
+_STARTUP_GEO_KEYS = ('geoMarkets', 'geo_markets', 'region', 'regions', 'geography')
+_STARTUP_INDUSTRY_KEYS = ('industry', 'sector', 'startup_industry')
+_STARTUP_FUNDING_KEYS = ('fundingTarget', 'funding_target')
+_STARTUP_STAGE_KEYS = ('fundingStage', 'funding_stage', 'stage')
+# Every alias group startup_fields reads, one per field (lets CSV rows carry only these columns)
+_STARTUP_FIELD_ALIASES = (
+    _STARTUP_NAME_KEYS, _STARTUP_GEO_KEYS, _STARTUP_INDUSTRY_KEYS, _STARTUP_FUNDING_KEYS, _STARTUP_STAGE_KEYS,
+)
 
+def startup_fields(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Clean extracted startup data into StartupData field values (validated by the caller)"""
     # Handle geoMarkets (accept snake_case + common synonyms like region)
-    geo_markets = data.get('geoMarkets', data.get('geo_markets', data.get('region', data.get('regions', data.get('geography', [])))))
+    geo_markets = first_key(data, _STARTUP_GEO_KEYS, [])
     if isinstance(geo_markets, str):
-        geo_markets = [g.strip() for g in re.split(r'[,;|]', geo_markets)]
+        geo_markets = [g.strip() for g in _LIST_SPLIT_RE.split(geo_markets)]
     
     # Handle fundingTarget
-    funding_target = data.get('fundingTarget', data.get('funding_target', 0))
-    if isinstance(funding_target, str):
+    funding_target = first_key(data, _STARTUP_FUNDING_KEYS, 0)
+    if isinstance(funding_target, str) and not funding_target.isdecimal():
         # Extract number from string
-        funding_target = re.sub(r'[^\d.]', '', funding_target)
+        funding_target = _DIGITS_RE.sub('', funding_target)
         funding_target = int(float(funding_target)) if funding_target else 0
     funding_target = safe_int(funding_target, 0)
     
-    return StartupData(
-        companyName=safe_str(data.get('companyName', data.get('company_name', data.get('name', '')))),
+    return dict(
+        companyName=safe_str(first_key(data, _STARTUP_NAME_KEYS, '')),
         geoMarkets=geo_markets if isinstance(geo_markets, list) else [],
-        industry=safe_str(data.get('industry', data.get('sector', data.get('startup_industry', '')))),
+        industry=safe_str(first_key(data, _STARTUP_INDUSTRY_KEYS, '')),
         fundingTarget=safe_int(funding_target, 0),
-        fundingStage=safe_str(data.get('fundingStage', data.get('funding_stage', data.get('stage', '')))),
+        fundingStage=safe_str(first_key(data, _STARTUP_STAGE_KEYS, '')),
         availabilityStatus='present'
     )
 
-def normalize_investor_data(data: Dict[str, Any]) -> InvestorData:
-    """Normalize extracted investor data to match schema"""
-    def safe_str(val: Any) -> str:
-        return val.strip() if isinstance(val, str) else (str(val).strip() if val is not None else "")
-    def safe_int(val: Any, default: int = 0) -> int:
+def normalize_startup_data(data: Dict[str, Any]) -> StartupData:
+    """Normalize extracted startup data to match schema"""
+    return StartupData(**startup_fields(data))
+
+# Investor field aliases, in priority order: model/JSON keys, Orbit CSV export columns, our CSV template headers
+_INVESTOR_GEO_KEYS = (
+    'geoFocus', 'geo_focus', 'Main Geographies Targeted (labels)', 'Location',
+    'geoMarkets', 'region', 'regions', 'geography',
+)
+_INVESTOR_INDUSTRY_KEYS = (
+    'industryPreferences', 'industry_preferences', '[BD] Vertical Interests / Vertical (labels)',
+    'Vertical Interests', 'industries', 'Industry Preferences',
+)
+_INVESTOR_STAGE_KEYS = ('stagePreferences', 'stage_preferences', 'stages', 'Stage Preferences')
+_INVESTOR_CHEQUE_KEYS = ('[INV] Cheque Size (labels)', 'Cheque Size', 'Check Size')
+_INVESTOR_MIN_TICKET_KEYS = ('minTicketSize', 'min_ticket_size', 'minInvestment', 'Min Ticket Size')
+_INVESTOR_MAX_TICKET_KEYS = ('maxTicketSize', 'max_ticket_size', 'maxInvestment', 'Max Ticket Size')
+_INVESTOR_SLOTS_KEYS = ('totalSlots', 'total_slots', 'slots', 'Total Slots')
+_INVESTOR_FIRM_KEYS = ('firmName', 'firm_name', 'Investor name', 'name', 'firm', 'Company Name', 'Firm Name')
+_INVESTOR_MEMBER_KEYS = (
+    'memberName', 'member_name', '🦅 [INV] Team Member (users)', '[INV] Team Member (users)', 'Team Member',
+    'investment_member', 'investorMemberName', 'contactName', 'partnerName', 'personName', 'Member Name',
+)
+_INVESTOR_TABLE_KEYS = ('tableNumber', 'table_number', 'table')
+_INVESTOR_FIELD_ALIASES = (
+    _INVESTOR_GEO_KEYS, _INVESTOR_INDUSTRY_KEYS, _INVESTOR_STAGE_KEYS, _INVESTOR_CHEQUE_KEYS,
+    _INVESTOR_MIN_TICKET_KEYS, _INVESTOR_MAX_TICKET_KEYS, _INVESTOR_SLOTS_KEYS, _INVESTOR_FIRM_KEYS,
+    _INVESTOR_MEMBER_KEYS, _INVESTOR_TABLE_KEYS,
+)
+
+def parse_number(value: Any) -> int:
+    """Ticket-size cell to an int, honouring K/M suffixes ("500K", "$2 million")."""
+    if value is None:
+        return 0
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, str):
+        if value.isdecimal():
+            return int(value)
+        # Handle currency and multipliers
+        val = value.upper()
+        multiplier = 1
+        if 'M' in val or 'MILLION' in val:
+            multiplier = 1000000
+        elif 'K' in val or 'THOUSAND' in val:
+            multiplier = 1000
+        digits = _DIGITS_RE.sub('', val)
         try:
-            if val is None:
-                return default
-            if isinstance(val, (int, float)):
-                return int(val)
-            if isinstance(val, str):
-                cleaned = re.sub(r'[^\d.]', '', val)
-                return int(float(cleaned)) if cleaned else default
-            return default
+            return int(float(digits) * multiplier) if digits else 0
         except Exception:
-            return default
-
-    # Handle lists
-    def parse_list(value):
-        if isinstance(value, list):
-            return value
-        if isinstance(value, str):
-            return [item.strip() for item in re.split(r'[,;|]', value) if item.strip()]
-        return []
-    
-    # Handle numbers
-    def parse_number(value):
-        if value is None:
             return 0
-        if isinstance(value, (int, float)):
-            return int(value)
-        if isinstance(value, str):
-            # Handle currency and multipliers
-            val = value.upper()
-            multiplier = 1
-            if 'M' in val or 'MILLION' in val:
-                multiplier = 1000000
-            elif 'K' in val or 'THOUSAND' in val:
-                multiplier = 1000
-            digits = re.sub(r'[^\d.]', '', val)
-            try:
-                return int(float(digits) * multiplier) if digits else 0
-            except Exception:
-                return 0
-        # Fallback for any other type
-        return safe_int(value, 0)
-    
-    geo_focus = parse_list(
-        data.get('geoFocus') or
-        data.get('geo_focus') or 
-        data.get('Main Geographies Targeted (labels)') or  # Orbit CSV format
-        data.get('Location') or
-        data.get('geoMarkets') or 
-        data.get('region') or 
-        data.get('regions') or 
-        data.get('geography') or 
-        []
-    )
-    
-    industry_prefs = parse_list(
-        data.get('industryPreferences') or 
-        data.get('industry_preferences') or 
-        data.get('[BD] Vertical Interests / Vertical (labels)') or  # Orbit CSV format
-        data.get('Vertical Interests') or
-        data.get('industries') or 
-        []
-    )
-    
-    stage_prefs = parse_list(
-        data.get('stagePreferences') or 
-        data.get('stage_preferences') or 
-        data.get('stages') or 
-        []
-    )
+    # Fallback for any other type
+    return safe_int(value, 0)
+
+def parse_cheque_label(label: str) -> Tuple[int, int]:
+    # Parse ranges like "100K-500K" or ">1M"
+    if '-' in label:
+        parts = label.split('-')
+        low = parse_number(parts[0]) if len(parts) > 0 else 0
+        high = parse_number(parts[1]) if len(parts) > 1 else low * 10
+    elif '>' in label:
+        low = parse_number(label.replace('>', ''))
+        high = low * 10
+    elif '<' in label:
+        high = parse_number(label.replace('<', ''))
+        low = high // 10
+    else:
+        low = parse_number(label)
+        high = low * 5
+    return low, high
+
+@lru_cache(maxsize=4096)
+def cheque_size_range(cheque_size: str) -> Tuple[int, int]:
+    """(min, max) ticket spanning every bucket in a cheque-size cell; exports repeat a handful of labels."""
+    # Orbit "(labels)" columns can hold several buckets (">1M, 100K-500K"): span all of them
+    labels = [l.strip() for l in _LABEL_SPLIT_RE.split(cheque_size) if l.strip()] or [cheque_size]
+    ranges = [parse_cheque_label(label) for label in labels]
+    return min(low for low, _ in ranges), max(high for _, high in ranges)
+
+def investor_fields(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Clean extracted investor data into InvestorData field values (validated by the caller)"""
+    geo_focus = parse_list(first_present(data, _INVESTOR_GEO_KEYS, []))
+    industry_prefs = parse_list(first_present(data, _INVESTOR_INDUSTRY_KEYS, []))
+    stage_prefs = parse_list(first_present(data, _INVESTOR_STAGE_KEYS, []))
     
     # Handle cheque/ticket size - may be a range like "100K-500K" or ">1M"
-    cheque_size_raw = data.get('[INV] Cheque Size (labels)') or data.get('Cheque Size') or data.get('Check Size') or ''
+    cheque_size_raw = first_present(data, _INVESTOR_CHEQUE_KEYS, '')
     
     if cheque_size_raw and isinstance(cheque_size_raw, str):
-        # Parse ranges like "100K-500K" or ">1M"
-        if '-' in cheque_size_raw:
-            parts = cheque_size_raw.split('-')
-            min_ticket = parse_number(parts[0]) if len(parts) > 0 else 0
-            max_ticket = parse_number(parts[1]) if len(parts) > 1 else min_ticket * 10
-        elif '>' in cheque_size_raw:
-            min_ticket = parse_number(cheque_size_raw.replace('>', ''))
-            max_ticket = min_ticket * 10
-        elif '<' in cheque_size_raw:
-            max_ticket = parse_number(cheque_size_raw.replace('<', ''))
-            min_ticket = max_ticket // 10
-        else:
-            min_ticket = parse_number(cheque_size_raw)
-            max_ticket = min_ticket * 5
+        min_ticket, max_ticket = cheque_size_range(cheque_size_raw)
     else:
-        min_ticket = parse_number(data.get('minTicketSize') or data.get('min_ticket_size') or data.get('minInvestment') or 0)
-        max_ticket = parse_number(data.get('maxTicketSize') or data.get('max_ticket_size') or data.get('maxInvestment') or 10000000)
+        min_ticket = parse_number(first_present(data, _INVESTOR_MIN_TICKET_KEYS, 0))
+        max_ticket = parse_number(first_present(data, _INVESTOR_MAX_TICKET_KEYS, 10000000))
     
-    total_slots = safe_int(data.get('totalSlots') or data.get('total_slots') or data.get('slots') or 3, 3)
+    total_slots = safe_int(first_present(data, _INVESTOR_SLOTS_KEYS, 3), 3)
 
     # Handle various column name formats from different sources
-    firm_name = safe_str(
-        data.get('firmName') or 
-        data.get('firm_name') or 
-        data.get('Investor name') or  # Orbit CSV format
-        data.get('name') or 
-        data.get('firm') or 
-        data.get('Company Name') or
-        ''
-    )
-    
-    member_name = safe_str(
-        data.get('memberName') or 
-        data.get('member_name') or 
-        data.get('🦅 [INV] Team Member (users)') or  # Orbit CSV format
-        data.get('[INV] Team Member (users)') or
-        data.get('Team Member') or
-        data.get('investment_member') or 
-        data.get('investorMemberName') or 
-        data.get('contactName') or 
-        data.get('partnerName') or 
-        data.get('personName') or 
-        ''
-    )
+    firm_name = safe_str(first_present(data, _INVESTOR_FIRM_KEYS, ''))
+    member_name = safe_str(first_present(data, _INVESTOR_MEMBER_KEYS, ''))
     
-    return InvestorData(
+    return dict(
         firmName=firm_name,
         memberName=member_name,
         geoFocus=geo_focus,
@@ -999,179 +1695,141 @@ def normalize_investor_data(data: Dict[str, Any]) -> InvestorData:
         minTicketSize=min_ticket,
         maxTicketSize=max_ticket,
         totalSlots=total_slots,
-        tableNumber=data.get('tableNumber', data.get('table_number', data.get('table', None))),
+        tableNumber=first_key(data, _INVESTOR_TABLE_KEYS),
+        availabilityStatus='present'
+    )
+
+def normalize_investor_data(data: Dict[str, Any]) -> InvestorData:
+    """Normalize extracted investor data to match schema"""
+    return InvestorData(**investor_fields(data))
+
+# Mentor and corporate field aliases, in priority order (model/JSON keys first, then CSV template headers)
+_MENTOR_NAME_KEYS = ('fullName', 'full_name', 'Full Name', 'name')
+_EMAIL_KEYS = ('email', 'Email')
+_MENTOR_LINKEDIN_KEYS = ('linkedinUrl', 'linkedin_url', 'LinkedIn URL', 'LinkedIn')
+_PARTNER_GEO_KEYS = ('geoFocus', 'geo_focus', 'Location', 'region')
+_PARTNER_INDUSTRY_KEYS = ('industryPreferences', 'industry_preferences', 'Industry Preferences', 'industries')
+_MENTOR_EXPERTISE_KEYS = ('expertiseAreas', 'expertise_areas', 'Expertise Areas', 'expertise')
+_PARTNER_SLOTS_KEYS = ('totalSlots', 'total_slots', 'Total Slots')
+_CORPORATE_FIRM_KEYS = ('firmName', 'firm_name', 'Company Name', 'companyName', 'name')
+_CORPORATE_CONTACT_KEYS = ('contactName', 'contact_name', 'Contact Name')
+_CORPORATE_PARTNERSHIP_KEYS = ('partnershipTypes', 'partnership_types', 'Partnership Types')
+_CORPORATE_STAGE_KEYS = ('stages', 'Stages')
+_MENTOR_FIELD_ALIASES = (
+    _MENTOR_NAME_KEYS, _EMAIL_KEYS, _MENTOR_LINKEDIN_KEYS, _PARTNER_GEO_KEYS, _PARTNER_INDUSTRY_KEYS,
+    _MENTOR_EXPERTISE_KEYS, _PARTNER_SLOTS_KEYS,
+)
+_CORPORATE_FIELD_ALIASES = (
+    _CORPORATE_FIRM_KEYS, _CORPORATE_CONTACT_KEYS, _EMAIL_KEYS, _PARTNER_GEO_KEYS, _PARTNER_INDUSTRY_KEYS,
+    _CORPORATE_PARTNERSHIP_KEYS, _CORPORATE_STAGE_KEYS, _PARTNER_SLOTS_KEYS,
+)
+
+def mentor_fields(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Clean extracted mentor data into MentorData field values (validated by the caller)"""
+    return dict(
+        fullName=safe_str(first_present(data, _MENTOR_NAME_KEYS, '')),
+        email=safe_str(first_present(data, _EMAIL_KEYS, '')),
+        linkedinUrl=safe_str(first_present(data, _MENTOR_LINKEDIN_KEYS)),
+        geoFocus=parse_list(first_present(data, _PARTNER_GEO_KEYS, [])),
+        industryPreferences=parse_list(first_present(data, _PARTNER_INDUSTRY_KEYS, [])),
+        expertiseAreas=parse_list(first_present(data, _MENTOR_EXPERTISE_KEYS, [])),
+        totalSlots=int(first_present(data, _PARTNER_SLOTS_KEYS, 3)),
         availabilityStatus='present'
     )
 
 def normalize_mentor_data(data: Dict[str, Any]) -> MentorData:
     """Normalize extracted mentor data to match schema"""
-    def safe_str(val: Any) -> str:
-        return val.strip() if isinstance(val, str) else (str(val).strip() if val is not None else "")
-    
-    def parse_list(value):
-        if isinstance(value, list):
-            return value
-        if isinstance(value, str):
-            return [item.strip() for item in re.split(r'[,;|]', value) if item.strip()]
-        return []
-    
-    full_name = safe_str(
-        data.get('fullName') or 
-        data.get('full_name') or 
-        data.get('Full Name') or 
-        data.get('name') or 
-        ''
-    )
-    
-    email = safe_str(
-        data.get('email') or 
-        data.get('Email') or 
-        ''
-    )
-    
-    linkedin_url = safe_str(
-        data.get('linkedinUrl') or 
-        data.get('linkedin_url') or 
-        data.get('LinkedIn URL') or 
-        data.get('LinkedIn') or 
-        None
-    )
-    
-    geo_focus = parse_list(
-        data.get('geoFocus') or
-        data.get('geo_focus') or 
-        data.get('Location') or
-        data.get('region') or 
-        []
-    )
-    
-    industry_prefs = parse_list(
-        data.get('industryPreferences') or 
-        data.get('industry_preferences') or 
-        data.get('Industry Preferences') or
-        data.get('industries') or 
-        []
-    )
-    
-    expertise_areas = parse_list(
-        data.get('expertiseAreas') or 
-        data.get('expertise_areas') or 
-        data.get('Expertise Areas') or
-        data.get('expertise') or 
-        []
-    )
-    
-    total_slots = int(data.get('totalSlots') or data.get('total_slots') or data.get('Total Slots') or 3)
-    
-    return MentorData(
-        fullName=full_name,
-        email=email,
-        linkedinUrl=linkedin_url,
-        geoFocus=geo_focus,
-        industryPreferences=industry_prefs,
-        expertiseAreas=expertise_areas,
-        totalSlots=total_slots,
+    return MentorData(**mentor_fields(data))
+
+def corporate_fields(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Clean extracted corporate data into CorporateData field values (validated by the caller)"""
+    return dict(
+        firmName=safe_str(first_present(data, _CORPORATE_FIRM_KEYS, '')),
+        contactName=safe_str(first_present(data, _CORPORATE_CONTACT_KEYS, '')),
+        email=safe_str(first_present(data, _EMAIL_KEYS)),
+        geoFocus=parse_list(first_present(data, _PARTNER_GEO_KEYS, [])),
+        industryPreferences=parse_list(first_present(data, _PARTNER_INDUSTRY_KEYS, [])),
+        partnershipTypes=parse_list(first_present(data, _CORPORATE_PARTNERSHIP_KEYS, [])),
+        stages=parse_list(first_present(data, _CORPORATE_STAGE_KEYS, [])),
+        totalSlots=int(first_present(data, _PARTNER_SLOTS_KEYS, 3)),
         availabilityStatus='present'
     )
 
 def normalize_corporate_data(data: Dict[str, Any]) -> CorporateData:
     """Normalize extracted corporate data to match schema"""
-    def safe_str(val: Any) -> str:
-        return val.strip() if isinstance(val, str) else (str(val).strip() if val is not None else "")
-    
-    def parse_list(value):
-        if isinstance(value, list):
-            return value
-        if isinstance(value, str):
-            return [item.strip() for item in re.split(r'[,;|]', value) if item.strip()]
-        return []
-    
-    firm_name = safe_str(
-        data.get('firmName') or 
-        data.get('firm_name') or 
-        data.get('Company Name') or 
-        data.get('companyName') or 
-        data.get('name') or 
-        ''
-    )
-    
-    contact_name = safe_str(
-        data.get('contactName') or 
-        data.get('contact_name') or 
-        data.get('Contact Name') or 
-        ''
-    )
-    
-    email = safe_str(
-        data.get('email') or 
-        data.get('Email') or 
-        None
-    )
-    
-    geo_focus = parse_list(
-        data.get('geoFocus') or
-        data.get('geo_focus') or 
-        data.get('Location') or
-        data.get('region') or 
-        []
-    )
-    
-    industry_prefs = parse_list(
-        data.get('industryPreferences') or 
-        data.get('industry_preferences') or 
-        data.get('Industry Preferences') or
-        data.get('industries') or 
-        []
-    )
-    
-    partnership_types = parse_list(
-        data.get('partnershipTypes') or 
-        data.get('partnership_types') or 
-        data.get('Partnership Types') or
-        []
-    )
-    
-    stages = parse_list(
-        data.get('stages') or 
-        data.get('Stages') or 
-        []
-    )
-    
-    total_slots = int(data.get('totalSlots') or data.get('total_slots') or data.get('Total Slots') or 3)
-    
-    return CorporateData(
-        firmName=firm_name,
-        contactName=contact_name,
-        email=email,
-        geoFocus=geo_focus,
-        industryPreferences=industry_prefs,
-        partnershipTypes=partnership_types,
-        stages=stages,
-        totalSlots=total_slots,
-        availabilityStatus='present'
-    )
+    return CorporateData(**corporate_fields(data))
+
+def cell_text(value: Any) -> str:
+    """Spreadsheet cell -> text. Strings (the common case) pass through without a str() call."""
+    if type(value) is str:
+        return value
+    return "" if value is None else str(value)
 
-async def extract_text_content(file: UploadFile) -> Tuple[str, str]:
+def sheet_rows_to_csv(rows) -> str:
+    """
+    Render spreadsheet rows as real CSV, quoting cells that contain commas, quotes or newlines
+    so the direct CSV parser reads the same columns back. Fully blank rows are dropped.
+    """
+    buf = StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    for cells in rows:
+        if any(cells):
+            writer.writerow(cells)
+    return buf.getvalue()
+
+# Leading signatures of the container formats we sniff for
+_MAGIC_SIGNATURES = {
+    b'%PDF': 'pdf',
+    b'PK\x03\x04': 'zip',  # OOXML (docx/xlsx) and other zip archives
+    b'\xd0\xcf\x11\xe0': 'ole',  # legacy Office (doc/xls)
+}
+
+def peek_zip_kind(source: Any) -> Tuple[Optional[str], Optional[zipfile.ZipFile]]:
+    """
+    Open a PK-signature upload (a seekable file object) once and classify it from the archive
+    listing: 'docx', 'xlsx', 'ooxml' (other Office container) or None (plain/corrupt zip).
+    The open ZipFile is returned so callers can read members without re-parsing it.
+    """
+    try:
+        archive = zipfile.ZipFile(source)
+        names = set(archive.namelist())
+    except Exception:
+        return None, None
+    if '[Content_Types].xml' not in names:
+        return None, archive
+    if 'word/document.xml' in names:
+        return 'docx', archive
+    if 'xl/workbook.xml' in names or any(n.startswith('xl/') for n in names):
+        return 'xlsx', archive
+    return 'ooxml', archive
+
+async def extract_text_content(file: UploadFile, content: Optional[bytes] = None) -> Tuple[str, str]:
     """
     Shared helper to read an uploaded file and extract text_content with best-effort parsing.
     Returns (file_ext, text_content).
+    content: the upload bytes when the caller already read them (extract_text_cached reads while
+    hashing), so the upload isn't read a second time.
     """
-    # Read the uploaded file bytes.
+    # The upload is already a spooled temp file (kept in memory when small, spilled to disk when
+    # large), so only the first chunk is read for type detection. Zip containers (xlsx/docx) are
+    # parsed straight from the spool; the whole upload is read into memory only for formats whose
+    # parsers need bytes.
     # On some setups, UploadFile may be at EOF (e.g. if something already read the stream),
-    # so we retry once after seeking back to the start.
-    content = await file.read()
-    if not content or len(content) == 0:
+    # so rewind before reading.
+    if content is not None:
+        head = content[:2048]
+    else:
         try:
             await file.seek(0)
-            content = await file.read()
         except Exception:
-            # If seek/read fails, we fall through to the empty-upload guard below.
+            # If seek fails, we fall through to the empty-upload guard below.
             pass
+        head = await file.read(2048)
     file_ext = file.filename.split('.')[-1].lower() if file.filename else ""
     text_content = None  # Initialize to None
 
     # Guard: empty upload (common when the browser upload failed or the file is zero bytes)
-    if not content or len(content) == 0:
+    if not head:
         raise HTTPException(
             status_code=400,
             detail=(
@@ -1184,31 +1842,33 @@ async def extract_text_content(file: UploadFile) -> Tuple[str, str]:
     # Normalize extension and detect by magic bytes only if we don't already recognize a handled type.
     handled_exts = {'pdf', 'xlsx', 'xls', 'csv', 'txt', 'json', 'doc', 'docx'}
     # Fallback detection by magic bytes (override when extension is missing or wrong)
-    # NOTE: some PDFs may have leading bytes before the %PDF header, so we search the first chunk.
-    head = content[:2048]
-    if b'%PDF' in head and file_ext not in handled_exts:
+    magic = next((kind for sig, kind in _MAGIC_SIGNATURES.items() if head.startswith(sig)), None)
+    if magic is None and file_ext not in handled_exts and b'%PDF' in head:
+        # NOTE: some PDFs have leading bytes before the %PDF header, so search the first chunk
+        magic = 'pdf'
+    # The zip opened by the docx/xlsx probe, reused by the DOCX fallback instead of re-reading the central directory
+    zip_archive = None
+    if magic == 'pdf' and file_ext not in handled_exts:
         file_ext = 'pdf'
-    elif head[:2] == b'PK' and b'[Content_Types].xml' in head:
-        # Peek inside the zip to disambiguate docx vs xlsx
-        try:
-            import zipfile
-            from io import BytesIO
-            with zipfile.ZipFile(BytesIO(content)) as z:
-                names = set(z.namelist())
-                if 'word/document.xml' in names:
-                    file_ext = 'docx'
-                elif 'xl/workbook.xml' in names or any(n.startswith('xl/') for n in names):
-                    file_ext = 'xlsx'
-                elif file_ext not in handled_exts:
-                    # default fallback
-                    file_ext = 'xlsx'
-        except Exception:
-            # fall back to extension if zip probe fails
-            if file_ext not in handled_exts and file_ext not in ['docx', 'xlsx']:
-                file_ext = 'xlsx'
-    elif content.startswith(b'\xd0\xcf\x11\xe0') and file_ext not in handled_exts:
+    elif magic == 'zip':
+        # Peek inside the zip to disambiguate docx vs xlsx ([Content_Types].xml sits in the
+        # central directory, which isn't reliably within the first bytes, so read the listing)
+        zip_kind, zip_archive = peek_zip_kind(file.file)
+        if zip_kind in ('docx', 'xlsx'):
+            file_ext = zip_kind
+        elif zip_kind == 'ooxml' and file_ext not in handled_exts:
+            # default fallback
+            file_ext = 'xlsx'
+    elif magic == 'ole' and file_ext not in handled_exts:
         # Old Office formats (could be doc or xls); if extension says doc, keep doc, else assume xls
         file_ext = 'doc' if file_ext == 'doc' else 'xls'
+
+    if file_ext in ('xlsx', 'docx'):
+        upload = file.file
+        upload.seek(0)
+    elif file_ext in handled_exts and content is None:
+        await file.seek(0)
+        content = await file.read()
     
     # Handle Excel files (XLSX, XLS)
     if file_ext in ['xlsx', 'xls']:
@@ -1216,28 +1876,18 @@ async def extract_text_content(file: UploadFile) -> Tuple[str, str]:
             if file_ext == 'xlsx':
                 try:
                     import openpyxl
-                    from io import BytesIO
                     
-                    excel_file = BytesIO(content)
-                    workbook = openpyxl.load_workbook(excel_file, data_only=True)
-                    text_content = ""
+                    # read_only streams rows from the XML instead of building every cell + style object
+                    workbook = openpyxl.load_workbook(upload, data_only=True, read_only=True)
                     
-                    # Get the first sheet
-                    sheet = workbook.active
-                    
-                    # Extract headers
-                    if sheet.max_row > 0:
-                        headers = []
-                        for cell in sheet[1]:
-                            headers.append(str(cell.value) if cell.value else "")
-                        text_content += ",".join(headers) + "\n"
-                        
-                        # Extract data rows
-                        for row in sheet.iter_rows(min_row=2, values_only=False):
-                            row_data = []
-                            for cell in row:
-                                row_data.append(str(cell.value) if cell.value else "")
-                            text_content += ",".join(row_data) + "\n"
+                    try:
+                        # Get the first sheet (header row first, then data rows)
+                        sheet = workbook.active
+                        text_content = sheet_rows_to_csv(
+                            [cell_text(v) for v in row] for row in sheet.iter_rows(values_only=True)
+                        )
+                    finally:
+                        workbook.close()
                     
                     if not text_content.strip():
                         raise HTTPException(status_code=400, detail="Excel file appears to be empty.")
@@ -1250,21 +1900,17 @@ async def extract_text_content(file: UploadFile) -> Tuple[str, str]:
                 try:
                     import xlrd
                     
-                    workbook = xlrd.open_workbook(file_contents=content)
-                    text_content = ""
-                    
-                    # Get the first sheet
-                    sheet = workbook.sheet_by_index(0)
+                    # on_demand: only the first sheet is parsed, not every sheet in the workbook
+                    workbook = xlrd.open_workbook(file_contents=content, on_demand=True)
                     
-                    # Extract headers
-                    if sheet.nrows > 0:
-                        headers = [str(sheet.cell_value(0, col)) for col in range(sheet.ncols)]
-                        text_content += ",".join(headers) + "\n"
-                        
-                        # Extract data rows
-                        for row_idx in range(1, sheet.nrows):
-                            row_data = [str(sheet.cell_value(row_idx, col)) for col in range(sheet.ncols)]
-                            text_content += ",".join(row_data) + "\n"
+                    try:
+                        # Get the first sheet (header row first, then data rows)
+                        sheet = workbook.sheet_by_index(0)
+                        text_content = sheet_rows_to_csv(
+                            [cell_text(v) for v in sheet.row_values(row_idx)] for row_idx in range(sheet.nrows)
+                        )
+                    finally:
+                        workbook.release_resources()
                     
                     if not text_content.strip():
                         raise HTTPException(status_code=400, detail="Excel file appears to be empty.")
@@ -1285,10 +1931,9 @@ async def extract_text_content(file: UploadFile) -> Tuple[str, str]:
     # Handle DOCX files (prefer python-docx for tables; fallback to raw XML)
     elif file_ext == 'docx':
         try:
-            from io import BytesIO
             try:
                 from docx import Document  # type: ignore
-                doc = Document(BytesIO(content))
+                doc = Document(upload)
                 parts = []
                 for p in doc.paragraphs:
                     if p.text and p.text.strip():
@@ -1301,14 +1946,13 @@ async def extract_text_content(file: UploadFile) -> Tuple[str, str]:
                 text_content = "\n".join(parts)
             except ImportError:
                 # Fallback: manual XML strip
-                import zipfile
-                with zipfile.ZipFile(BytesIO(content)) as z:
+                if zip_archive is None:
+                    zip_archive = zipfile.ZipFile(upload)
+                with zip_archive as z:
                     with z.open('word/document.xml') as doc_xml:
                         raw_xml = doc_xml.read().decode('utf-8', errors='ignore')
-                        # Replace paragraph boundaries with newline
-                        raw_xml = raw_xml.replace('</w:p>', '\n')
-                        # Strip XML tags
-                        text_content = re.sub(r'<[^>]+>', '', raw_xml)
+                        # Paragraph boundaries become newlines, then strip XML tags
+                        text_content = _XML_TAG_RE.sub('', raw_xml.replace('</w:p>', '\n'))
             if not text_content or not text_content.strip():
                 raise HTTPException(status_code=400, detail="DOCX appears to have no extractable text. If this is a scanned/image DOCX, re-save as PDF or CSV.")
         except KeyError:
@@ -1321,11 +1965,10 @@ async def extract_text_content(file: UploadFile) -> Tuple[str, str]:
         try:
             # DOC is legacy OLE; we don't depend on heavy converters here.
             # Best-effort: decode as latin-1 ignoring errors and strip control chars.
-            raw = content.decode('latin-1', errors='ignore')
-            # Remove nulls and most control chars
-            cleaned = re.sub(r'[\x00-\x08\x0B-\x1F\x7F]', ' ', raw)
+            # Remove nulls and most control chars (one C-level table pass over the bytes; latin-1 maps 1:1)
+            raw = content.translate(_DOC_CTRL_TABLE).decode('latin-1', errors='ignore')
             # Collapse whitespace
-            cleaned = re.sub(r'\s+', ' ', cleaned).strip()
+            cleaned = _WS_RE.sub(' ', raw).strip()
             if len(cleaned) < 20:
                 raise HTTPException(status_code=400, detail="DOC (legacy Word) has no extractable text. Please re-save as DOCX or PDF and re-upload.")
             text_content = cleaned
@@ -1345,36 +1988,31 @@ async def extract_text_content(file: UploadFile) -> Tuple[str, str]:
                 detail=f'File has ".pdf" extension but does not look like a valid PDF (missing %PDF header). First bytes (hex): {head_hex}'
             )
 
-        # 1) Try PyMuPDF first with PARALLEL processing (often more robust than PyPDF2/pdfplumber on quirky PDFs)
+        # 1) Try PyMuPDF first (often more robust than pypdf/pdfplumber on quirky PDFs)
         pymupdf_error = None
         try:
             import fitz  # PyMuPDF
-            from io import BytesIO
-            import concurrent.futures
 
-            doc = fitz.open(stream=BytesIO(content).getvalue(), filetype="pdf")
-            page_limit = min(doc.page_count, MAX_PDF_PAGES)
-            
-            # Parallel page extraction for speed (using thread pool since PyMuPDF is sync)
-            import concurrent.futures
-            
-            def extract_page_sync(i: int) -> str:
-                try:
-                    page = doc.load_page(i)
-                    page_text = page.get_text("text") or ""
-                    return f"\n--- Page {i + 1} ---\n{page_text}"
-                except Exception as e:
-                    return f"\n--- Page {i + 1} (error: {e}) ---\n"
-            
-            # Process pages in parallel using ThreadPoolExecutor
-            parts = []
-            with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_PARALLEL_PAGES) as executor:
-                futures = [executor.submit(extract_page_sync, i) for i in range(page_limit)]
-                for future in concurrent.futures.as_completed(futures):
-                    parts.append(future.result())
-            
-            # Sort parts by page number to maintain order
-            parts.sort(key=lambda x: int(re.search(r'Page (\d+)', x).group(1)) if re.search(r'Page (\d+)', x) else 0)
+            # PyMuPDF reads bytes directly (no BytesIO copy); the with-block frees the document promptly
+            with fitz.open(stream=content, filetype="pdf") as doc:
+                page_limit = min(doc.page_count, MAX_PDF_PAGES)
+                
+                # In page order on the one open document: a Document isn't safe to share across
+                # threads, and text extraction holds the GIL anyway, so a thread pool only added overhead.
+                # Stop once we have more text than the model will ever see (convert_data converts at most
+                # MAX_MODEL_INPUT_CHUNKS chunks of MAX_MODEL_INPUT_CHARS), so long text-heavy PDFs don't
+                # pay for every page.
+                parts = []
+                extracted_chars = 0
+                for i in range(page_limit):
+                    try:
+                        page_text = doc.load_page(i).get_text("text") or ""
+                        parts.append(f"\n--- Page {i + 1} ---\n{page_text}")
+                        extracted_chars += len(page_text)
+                    except Exception as e:
+                        parts.append(f"\n--- Page {i + 1} (error: {e}) ---\n")
+                    if extracted_chars >= MAX_MODEL_INPUT_CHARS * MAX_MODEL_INPUT_CHUNKS:
+                        break
             
             text_content = "\n".join(parts).strip()
         except Exception as e:
@@ -1389,18 +2027,17 @@ async def extract_text_content(file: UploadFile) -> Tuple[str, str]:
         if text_content and len(text_content.strip()) < 50 and ANTHROPIC_API_KEY:
             try:
                 import fitz  # PyMuPDF
-                from io import BytesIO
-                
-                doc = fitz.open(stream=BytesIO(content).getvalue(), filetype="pdf")
-                page_limit = min(doc.page_count, MAX_PDF_PAGES, 10)  # Limit for vision API cost
                 
-                # Convert pages to images for Claude Vision
-                page_images = []
-                for i in range(page_limit):
-                    page = doc.load_page(i)
-                    # Render page as PNG (300 DPI for good quality)
-                    pix = page.get_pixmap(matrix=fitz.Matrix(300/72, 300/72))
-                    page_images.append(pix.tobytes("png"))
+                with fitz.open(stream=content, filetype="pdf") as doc:
+                    page_limit = min(doc.page_count, MAX_PDF_PAGES, 10)  # Limit for vision API cost
+                    
+                    # Convert pages to images for Claude Vision
+                    page_images = []
+                    for i in range(page_limit):
+                        page = doc.load_page(i)
+                        # Render page as PNG (300 DPI for good quality)
+                        pix = page.get_pixmap(matrix=fitz.Matrix(300/72, 300/72))
+                        page_images.append(pix.tobytes("png"))
                 
                 claude_text = await extract_with_claude_vision(page_images)
                 if claude_text and len(claude_text.strip()) >= 50:
@@ -1409,77 +2046,89 @@ async def extract_text_content(file: UploadFile) -> Tuple[str, str]:
                 print(f"Claude Vision fallback failed: {claude_error}")
                 # Continue to next fallback
 
-        # Try PyPDF2 first, but fall back to pdfplumber on ANY failure (PyPDF2 can throw UnicodeDecodeError on some PDFs)
-        py_pdf2_error = None
+        # 3) pdfplumber, then pypdf as the last text-layer attempt before OCR
+        # (PyPDF2, pypdf's unmaintained predecessor, was slower and tripped over UnicodeDecodeError)
+        plumber_error = None
+        text_content = None
         try:
-            import PyPDF2
-            from io import BytesIO
+            import pdfplumber
             
             pdf_file = BytesIO(content)
-            pdf_reader = PyPDF2.PdfReader(pdf_file)
-            text_content = ""
+            parts = []
             
-            page_limit = min(len(pdf_reader.pages), MAX_PDF_PAGES)
-            for page_num in range(page_limit):
-                page = pdf_reader.pages[page_num]
-                text_content += f"\n--- Page {page_num + 1} ---\n"
-                extracted = page.extract_text()
-                if extracted:
-                    text_content += extracted
+            with pdfplumber.open(pdf_file) as pdf:
+                page_limit = min(len(pdf.pages), MAX_PDF_PAGES)
+                for page_num in range(page_limit):
+                    page = pdf.pages[page_num]
+                    parts.append(f"\n--- Page {page_num + 1} ---\n")
+                    page_text = page.extract_text()
+                    if page_text:
+                        parts.append(page_text)
+            text_content = "".join(parts)
             
             if not text_content.strip():
                 raise HTTPException(status_code=400, detail="PDF appears to be empty or image-based. Could not extract text.")
         except Exception as e:
-            py_pdf2_error = e
-            # Fallback: try pdfplumber
+            plumber_error = e
+            text_content = None
+
+        pypdf_error = None
+        if text_content is None:
             try:
-                import pdfplumber
-                from io import BytesIO
+                try:
+                    from pypdf import PdfReader
+                except ImportError:
+                    from PyPDF2 import PdfReader  # older installs
                 
-                pdf_file = BytesIO(content)
-                text_content = ""
+                pdf_reader = PdfReader(BytesIO(content))
+                parts = []
                 
-                with pdfplumber.open(pdf_file) as pdf:
-                    page_limit = min(len(pdf.pages), MAX_PDF_PAGES)
-                    for page_num in range(page_limit):
-                        page = pdf.pages[page_num]
-                        text_content += f"\n--- Page {page_num + 1} ---\n"
-                        page_text = page.extract_text()
-                        if page_text:
-                            text_content += page_text
+                page_limit = min(len(pdf_reader.pages), MAX_PDF_PAGES)
+                for page_num in range(page_limit):
+                    page = pdf_reader.pages[page_num]
+                    parts.append(f"\n--- Page {page_num + 1} ---\n")
+                    extracted = page.extract_text()
+                    if extracted:
+                        parts.append(extracted)
+                text_content = "".join(parts)
                 
                 if not text_content.strip():
                     raise HTTPException(status_code=400, detail="PDF appears to be empty or image-based. Could not extract text.")
-            except ImportError:
+            except Exception as e:
+                pypdf_error = e
+                text_content = None
+
+        if text_content is None:
+            if isinstance(plumber_error, ImportError) and isinstance(pypdf_error, ImportError) and pymupdf_error is not None:
                 raise HTTPException(
                     status_code=500,
-                    detail="PDF support requires PyPDF2 or pdfplumber. Install with: pip install PyPDF2 pdfplumber"
+                    detail="PDF support requires PyMuPDF, pypdf or pdfplumber. Install with: pip install PyMuPDF pypdf pdfplumber"
                 )
-            except Exception as plumber_error:
-                # If text extraction failed, try OCR (scanned/image PDFs)
-                ocr_text = try_ocr_pdf_bytes(content)
-                if ocr_text and len(ocr_text.strip()) >= 50:
-                    return file_ext, ocr_text
 
-                # If OCR didn't help, surface a helpful error
-                raise HTTPException(
-                    status_code=400,
-                    detail=(
-                        "Could not extract text from PDF (likely scanned/image-only or corrupted), and OCR also failed or returned empty.\n"
-                        f"PyMuPDF error: {str(pymupdf_error)}; PyPDF2 error: {str(py_pdf2_error)}; pdfplumber error: {str(plumber_error)}\n"
-                        "Fix: upload the original XLSX/CSV, or OCR/export a searchable PDF."
-                    )
+            # If text extraction failed, try OCR (scanned/image PDFs)
+            ocr_text = await try_ocr_pdf_bytes(content)
+            if ocr_text and len(ocr_text.strip()) >= 50:
+                return file_ext, ocr_text
+
+            # If OCR didn't help, surface a helpful error
+            raise HTTPException(
+                status_code=400,
+                detail=(
+                    "Could not extract text from PDF (likely scanned/image-only or corrupted), and OCR also failed or returned empty.\n"
+                    f"PyMuPDF error: {str(pymupdf_error)}; pdfplumber error: {str(plumber_error)}; pypdf error: {str(pypdf_error)}\n"
+                    "Fix: upload the original XLSX/CSV, or OCR/export a searchable PDF."
                 )
+            )
     elif file_ext in ['csv', 'txt', 'json']:
         # Regular text files (CSV, TXT, JSON)
         try:
-            text_content = content.decode('utf-8')
+            # utf-8-sig also drops the BOM Excel/Notepad put in front of UTF-8 CSVs, which would
+            # otherwise stick to the first header and hide that column from the alias lookup
+            text_content = content.decode('utf-8-sig')
         except UnicodeDecodeError:
-            # Try other encodings
-            try:
-                text_content = content.decode('latin-1')
-            except:
-                raise HTTPException(status_code=400, detail="Could not decode file. Please ensure it's a text-based file (CSV, TXT, JSON).")
+            # Not UTF-8: Windows exports are usually cp1252/latin-1, and decoding as latin-1 keeps
+            # accented names intact (errors='replace' would turn them into U+FFFD). It maps every byte, so it can't fail.
+            text_content = content.decode('latin-1')
     else:
         # Unsupported format - explicitly prevent binary files from being decoded as text
         raise HTTPException(
@@ -1493,6 +2142,31 @@ async def extract_text_content(file: UploadFile) -> Tuple[str, str]:
     
     return file_ext, text_content
 
+async def extract_text_cached(file: UploadFile) -> Tuple[str, str]:
+    """
+    extract_text_content, memoized by a hash of the upload bytes and extension, so re-uploading
+    the same file skips parsing/OCR (the conversion caches then cover the model call).
+    """
+    # Hash while reading and keep the chunks, so a cache miss hands the bytes straight to the
+    # extractor instead of reading the upload a second time
+    digest = hashlib.sha256()
+    buf = BytesIO()
+    await file.seek(0)
+    while chunk := await file.read(1 << 20):
+        digest.update(chunk)
+        buf.write(chunk)
+    file_ext = file.filename.split('.')[-1].lower() if file.filename else ""
+    digest.update(b"\0" + file_ext.encode("utf-8"))
+    key = digest.hexdigest()
+
+    cached = extraction_cache.get(key)
+    if cached is not None:
+        return cached
+    result = await extract_text_content(file, buf.getvalue())
+    extraction_cache.put(key, result)
+    return result
+
+
 @app.get("/")
 async def root():
     return {
@@ -1501,7 +2175,8 @@ async def root():
         "endpoints": {
             "/convert": "POST - Convert unstructured data",
             "/health": "GET - Health check",
-            "/models": "GET - List available Ollama models"
+            "/models": "GET - List available Ollama models",
+            "/cache/stats": "GET - Response cache hit/miss counters"
         }
     }
 
@@ -1558,168 +2233,225 @@ async def list_models():
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to list models: {str(e)}")
 
-def try_direct_csv_parse(text_data: str, data_type: Optional[str]) -> Optional[ConversionResponse]:
+@app.get("/cache/stats")
+async def cache_stats():
+    """Hit/miss counters and sizes of the in-process response caches"""
+    return {
+        "conversion": conversion_exact_cache.stats(),
+        "semantic": {"enabled": SEMANTIC_CACHE_ENABLED, **conversion_semantic_cache.stats()},
+        "direct_parse": direct_parse_cache.stats(),
+        "extraction": extraction_cache.stats(),
+        "embeddings": embedding_cache.stats(),
+    }
+
+_RECORD_ADAPTERS: Dict[Any, TypeAdapter] = {}
+# Rows per pydantic-core call: each call holds the GIL throughout, so large tables parsed in a
+# worker thread are validated in slices to let the event loop run in between
+_RECORD_VALIDATE_SLICE = 1000
+
+def build_records(model_cls: Any, fields_fn: Any, rows: List[Dict[str, Any]], label: str) -> Tuple[List[Any], List[str]]:
     """
-    Try to parse CSV directly without Ollama if headers are clear.
-    Returns ConversionResponse if successful, None if uncertain.
+    Clean every row with fields_fn, then validate the whole batch in one pydantic-core pass
+    (cheaper than a model constructor call per row). If anything fails, redo the batch row by
+    row so each bad row gets its own warning, exactly as before.
     """
-    def normalize_header(value: str) -> str:
-        if not value:
-            return ""
-        lowered = value.lower()
-        lowered = re.sub(r'\[.*?\]', ' ', lowered)
-        lowered = re.sub(r'[^a-z0-9\s]', ' ', lowered)
-        lowered = re.sub(r'\s+', ' ', lowered).strip()
-        return lowered
+    adapter = _RECORD_ADAPTERS.get(model_cls)
+    if adapter is None:
+        adapter = _RECORD_ADAPTERS[model_cls] = TypeAdapter(List[model_cls])
+    try:
+        cleaned = [fields_fn(row) for row in rows]
+        validated = []
+        for start in range(0, len(cleaned), _RECORD_VALIDATE_SLICE):
+            validated.extend(adapter.validate_python(cleaned[start:start + _RECORD_VALIDATE_SLICE]))
+        return validated, []
+    except Exception:
+        pass
+
+    records = []
+    warnings = []
+    for row in rows:
+        try:
+            records.append(model_cls(**fields_fn(row)))
+        except Exception as e:
+            warnings.append(f"Error parsing {label} row: {str(e)}")
+    return records, warnings
 
+# Formats whose extracted text is already a comma-separated table (Excel sheets are flattened to CSV)
+TABULAR_FORMATS = {"csv", "xlsx", "xls"}
+# Header rows are looked for in the first N lines only (preamble rows above the table, e.g. report titles)
+CSV_HEADER_SCAN_LIMIT = max(1, int(os.getenv("CSV_HEADER_SCAN_LIMIT", "50")))
+
+
+def detect_structured_csv(text_data: str) -> Optional[Any]:
+    """
+    Cheap check for tabular text that arrived without a CSV format (e.g. rows pasted from a
+    spreadsheet, which are tab-separated). Returns the sniffed csv dialect, or None if the
+    sample doesn't look like a delimited table.
+    """
+    sample = text_data[:8192]
+    if len(text_data) > len(sample) and "\n" in sample:
+        sample = sample[:sample.rindex("\n")]  # don't sniff a half line
+    if "\n" not in sample.strip():
+        return None
     try:
-        # Parse rows with csv.reader to detect header row even if file starts with blank lines
-        raw_rows = list(csv.reader(StringIO(text_data)))
-        if not raw_rows:
-            return None
+        return csv.Sniffer().sniff(sample, delimiters=",\t;|")
+    except csv.Error:
+        return None
+
+def normalize_header(value: str) -> str:
+    """Lowercase a CSV header and drop "[INV]"-style tags and punctuation."""
+    if not value:
+        return ""
+    lowered = _HDR_BRACKETS_RE.sub(' ', value.lower())
+    lowered = _HDR_NONALNUM_RE.sub(' ', lowered)
+    return _WS_RE.sub(' ', lowered).strip()
+
+
+# Normalized header -> the field it signals, for picking the record type of a table
+_HEADER_FIELD_SIGNALS = {
+    'full name': 'fullName', 'fullname': 'fullName',
+    'email': 'email',
+    'contact name': 'contactName', 'contactname': 'contactName',
+    'firm name': 'firmName', 'firmname': 'firmName',
+    'company name': 'companyName', 'companyname': 'companyName',
+    'investor name': 'investorName',
+    'member name': 'memberName', 'membername': 'memberName',
+    'funding': 'funding',
+    'stage': 'stage',
+}
+
+
+def _finalize_investor(inv: InvestorData) -> Optional[InvestorData]:
+    if not inv.firmName:
+        return None
+    if not inv.memberName:
+        return inv.model_copy(update={"memberName": "UNKNOWN"})
+    return inv
+
+
+# Record types a header row can signal, checked in priority order:
+# (detectedType, header test on the signalled fields, model, field builder, columns read,
+#  finalizer returning the record to keep or None)
+_CSV_RECORD_TYPES = (
+    ('mentor', lambda f: 'fullName' in f and 'email' in f,
+     MentorData, mentor_fields, _MENTOR_FIELD_ALIASES, lambda m: m if m.fullName and m.email else None),
+    ('corporate', lambda f: 'contactName' in f and ('firmName' in f or 'companyName' in f),
+     CorporateData, corporate_fields, _CORPORATE_FIELD_ALIASES, lambda c: c if c.firmName and c.contactName else None),
+    ('investor', lambda f: ('investorName' in f or 'firmName' in f) and 'memberName' in f,
+     InvestorData, investor_fields, _INVESTOR_FIELD_ALIASES, _finalize_investor),
+    ('startup', lambda f: 'companyName' in f and ('funding' in f or 'stage' in f),
+     StartupData, startup_fields, _STARTUP_FIELD_ALIASES, lambda s: s if s.companyName else None),
+)
 
-        header_idx = None
-        normalized_rows = []
-        for idx, row in enumerate(raw_rows):
+
+def csv_row_columns(header: List[str], field_aliases: Tuple[Tuple[str, ...], ...]) -> List[Tuple[str, int]]:
+    """
+    (row key, column index) for every header column a normalizer reads. When a field is backed by a
+    single column, that column is carried under the field's first alias, so first_present/first_key
+    find it on the first probe instead of missing through the other aliases on every row.
+    """
+    readers: Dict[str, int] = {}  # alias -> number of fields that read it
+    for aliases in field_aliases:
+        for alias in aliases:
+            readers[alias] = readers.get(alias, 0) + 1
+    present = set(header)
+    rename = {}
+    for aliases in field_aliases:
+        used = [alias for alias in aliases if alias in present]
+        if len(used) == 1 and readers[used[0]] == 1 and readers[aliases[0]] == 1:
+            rename[used[0]] = aliases[0]
+    return [(rename.get(name, name), idx) for idx, name in enumerate(header) if name in readers]
+
+def try_direct_csv_parse(text_data: str, data_type: Optional[str], dialect: Any = csv.excel) -> Optional[ConversionResponse]:
+    """
+    Try to parse CSV directly without Ollama if headers are clear.
+    Returns ConversionResponse if successful, None if uncertain.
+    """
+    try:
+        # One streaming pass: buffer only the header candidates, then feed the remaining rows
+        # straight into the record build without materializing the whole table
+        reader = csv.reader(StringIO(text_data), dialect)
+        scanned: List[List[str]] = []
+        header = None
+        # normalize_header runs only on these candidate rows, never on data rows; the chosen
+        # header's normalized form is kept for type detection below
+        first_normalized: Optional[List[str]] = None
+        for row in reader:
+            scanned.append(row)
+            if len(scanned) > CSV_HEADER_SCAN_LIMIT:
+                break
             normalized = [normalize_header(cell) for cell in row]
-            normalized_rows.append(normalized)
+            if first_normalized is None:
+                first_normalized = normalized
             if not any(normalized):
                 continue
-            # Look for known header signals
+            # Look for known header signals (exact names via set lookups; substring signals in one pass)
+            names = set(normalized)
+            has_member = "member" in names or any("team member" in h for h in names)
+            has_funding = "stage" in names or any("funding" in h for h in names)
             if (
-                ("investor name" in normalized or "firm name" in normalized) and
-                any("team member" in h or "member" == h for h in normalized)
+                (("investor name" in names or "firm name" in names) and has_member) or
+                ("company name" in names and has_funding) or
+                ("full name" in names and "email" in names) or
+                (("contact name" in names or "contact" in names) and ("firm name" in names or "company name" in names))
             ):
-                header_idx = idx
-                break
-            if ("company name" in normalized and any("funding" in h or "stage" == h for h in normalized)):
-                header_idx = idx
-                break
-            if ("full name" in normalized and "email" in normalized):
-                header_idx = idx
-                break
-            if (("contact name" in normalized or "contact" in normalized) and ("firm name" in normalized or "company name" in normalized)):
-                header_idx = idx
+                header = row
                 break
 
-        if header_idx is None:
-            # Fallback to DictReader using first line as headers
-            reader = csv.DictReader(StringIO(text_data))
-            rows = list(reader)
+        if not scanned:
+            return None
+        if header is None:
+            # Fallback: first line as headers (rows read like csv.DictReader's: short rows padded with None)
+            header = scanned[0]
+            header_normalized = first_normalized
+            data_rows = (row for row in chain(scanned[1:], reader) if row)
+            pad = None
         else:
-            header = raw_rows[header_idx]
-            data_rows = raw_rows[header_idx + 1 :]
-            rows = []
-            for row in data_rows:
-                if not any(cell.strip() for cell in row if isinstance(cell, str)) and not any(row):
-                    continue
-                record = {header[i]: (row[i] if i < len(row) else "") for i in range(len(header))}
-                rows.append(record)
-
-        if not rows:
+            header_normalized = normalized
+            data_rows = (row for row in reader if any(row))
+            pad = ""
+        first_data_row = next(data_rows, None)
+        if first_data_row is None:
             return None
+        data_rows = chain([first_data_row], data_rows)
+        width = len(header)
+
+        def rows_for(field_aliases: Tuple[Tuple[str, ...], ...]) -> List[Dict[str, Any]]:
+            # Resolve the columns the normalizer reads to indexes once, then carry only those per row
+            # (a repeated header keeps its last column, as dict(zip(header, row)) would)
+            columns = csv_row_columns(header, field_aliases)
+            records = []
+            for row in data_rows:
+                if len(row) < width:
+                    row = row + [pad] * (width - len(row))
+                records.append({name: row[idx] for name, idx in columns})
+            return records
 
-        # Check first row to determine type
-        first_row = rows[0]
-        headers_lower = {normalize_header(k): k for k in first_row.keys() if k}
+        # Determine type from the header row
+        headers_lower = {norm: k for norm, k in zip(header_normalized, header) if k}
         
         print(f"[DEBUG] CSV Headers detected: {list(headers_lower.keys())}")
         
-        # Detect type based on headers
-        has_mentor_headers = any(h in headers_lower for h in ['full name', 'fullname']) and any(h in headers_lower for h in ['email'])
-        has_corporate_headers = any(h in headers_lower for h in ['contact name', 'contactname']) and any(h in headers_lower for h in ['firm name', 'firmname', 'company name', 'companyname'])
-        has_investor_headers = any(h in headers_lower for h in ['investor name', 'firm name', 'firmname']) and any(h in headers_lower for h in ['member name', 'membername', 'team member'])
-        has_startup_headers = any(h in headers_lower for h in ['company name', 'companyname']) and any(h in headers_lower for h in ['funding', 'stage'])
-        
-        print(f"[DEBUG] Mentor headers: {has_mentor_headers}, Corporate: {has_corporate_headers}, Investor: {has_investor_headers}, Startup: {has_startup_headers}")
-        
-        startups = []
-        investors = []
-        mentors = []
-        corporates = []
-        warnings = []
-        
-        if has_mentor_headers:
-            for row in rows:
-                try:
-                    mentor = normalize_mentor_data(row)
-                    if mentor.fullName and mentor.email:
-                        mentors.append(mentor)
-                except Exception as e:
-                    warnings.append(f"Error parsing mentor row: {str(e)}")
-            
-            if mentors:
-                return ConversionResponse(
-                    startups=[],
-                    investors=[],
-                    mentors=mentors,
-                    corporates=[],
-                    detectedType="mentor",
-                    confidence=0.95,
-                    warnings=warnings,
-                    errors=[]
-                )
-        
-        elif has_corporate_headers:
-            for row in rows:
-                try:
-                    corp = normalize_corporate_data(row)
-                    if corp.firmName and corp.contactName:
-                        corporates.append(corp)
-                except Exception as e:
-                    warnings.append(f"Error parsing corporate row: {str(e)}")
-            
-            if corporates:
-                return ConversionResponse(
-                    startups=[],
-                    investors=[],
-                    mentors=[],
-                    corporates=corporates,
-                    detectedType="corporate",
-                    confidence=0.95,
-                    warnings=warnings,
-                    errors=[]
-                )
+        # Detect type based on headers: one pass maps the normalized headers to the fields they signal
+        fields = {_HEADER_FIELD_SIGNALS[h] for h in headers_lower if h in _HEADER_FIELD_SIGNALS}
+        # Orbit exports label the member column "🦅 [INV] Team Member (users)" -> "team member users"
+        if any('team member' in h for h in headers_lower):
+            fields.add('memberName')
+        detected = next((t for t in _CSV_RECORD_TYPES if t[1](fields)), None)
         
-        elif has_investor_headers:
-            for row in rows:
-                try:
-                    inv = normalize_investor_data(row)
-                    if inv.firmName:
-                        if not inv.memberName:
-                            inv.memberName = "UNKNOWN"
-                        investors.append(inv)
-                except Exception as e:
-                    warnings.append(f"Error parsing investor row: {str(e)}")
-            
-            if investors:
-                return ConversionResponse(
-                    startups=[],
-                    investors=investors,
-                    mentors=[],
-                    corporates=[],
-                    detectedType="investor",
-                    confidence=0.95,
-                    warnings=warnings,
-                    errors=[]
-                )
+        print(f"[DEBUG] Detected record type: {detected[0] if detected else None}")
         
-        elif has_startup_headers:
-            for row in rows:
-                try:
-                    startup = normalize_startup_data(row)
-                    if startup.companyName:
-                        startups.append(startup)
-                except Exception as e:
-                    warnings.append(f"Error parsing startup row: {str(e)}")
+        if detected:
+            record_type, _, model_cls, fields_fn, field_aliases, finalize = detected
+            records, warnings = build_records(model_cls, fields_fn, rows_for(field_aliases), record_type)
+            records = [kept for kept in map(finalize, records) if kept is not None]
             
-            if startups:
+            if records:
+                buckets = {'startups': [], 'investors': [], 'mentors': [], 'corporates': []}
+                buckets[record_type + 's'] = records
                 return ConversionResponse(
-                    startups=startups,
-                    investors=[],
-                    mentors=[],
-                    corporates=[],
-                    detectedType="startup",
+                    **buckets,
+                    detectedType=record_type,
                     confidence=0.95,
                     warnings=warnings,
                     errors=[]
@@ -1732,299 +2464,703 @@ def try_direct_csv_parse(text_data: str, data_type: Optional[str]) -> Optional[C
         print(f"Direct CSV parse exception: {e}")
         return None
 
-@app.post("/convert", response_model=ConversionResponse)
-async def convert_data(request: ConversionRequest):
+class ResponseCache:
     """
-    Convert unstructured data to structured format using Ollama
+    Exact-match LRU cache of JSON-serializable payloads keyed by content hash.
+    If db_path is set, entries are also written through to sqlite and read back on a
+    memory miss, so the cache survives restarts. Entries older than ttl_seconds (if set) are misses.
+    With model_cls, values are instances of that pydantic model: kept as objects in memory (a hit
+    doesn't re-validate every record) and stored as their JSON dump in sqlite.
     """
-    # Try direct CSV parsing first if format is CSV
-    if request.format == 'csv':
-        try:
-            direct_result = try_direct_csv_parse(request.data, request.dataType)
-            if direct_result:
-                return direct_result
-        except Exception as e:
-            # If direct CSV parsing fails, fall through to Ollama
-            print(f"Direct CSV parse failed, falling back to Ollama: {e}")
-    
-    try:
-        # Create prompt
-        prompt = create_conversion_prompt(request.data, request.dataType)
 
-        # Decide which provider to use
-        use_claude = ANTHROPIC_API_KEY is not None and ANTHROPIC_API_KEY.strip() != ""
-        if CONVERTER_PROVIDER == "claude" or use_claude:
-            response_text = await call_anthropic(prompt)
+    def __init__(
+        self,
+        max_entries: int,
+        db_path: Optional[str] = None,
+        table: str = "response_cache",
+        ttl_seconds: Optional[float] = None,
+        model_cls: Optional[Any] = None,
+    ):
+        self.max_entries = max_entries
+        self.db_path = db_path
+        self.table = table
+        self.ttl_seconds = ttl_seconds
+        self.model_cls = model_cls
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._db: Optional[sqlite3.Connection] = None
+        if db_path:
             try:
-                parsed_data = parse_ollama_response(response_text)
-            except Exception:
-                retry_prompt = (
-                    "Return ONLY valid JSON. Do not include markdown or explanations. "
-                    "Restart the JSON from scratch and ensure all brackets are closed.\n\n"
-                    + create_conversion_prompt(request.data, request.dataType)
+                self._db = sqlite3.connect(db_path, check_same_thread=False)
+                self._db.execute(
+                    f"CREATE TABLE IF NOT EXISTS {table} "
+                    "(key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
                 )
-                retry_text = await call_anthropic(retry_prompt)
-                parsed_data = parse_ollama_response(retry_text)
-        else:
-            # Check models via HTTP API (more reliable than python ollama.list on some setups)
+                self._db.commit()
+            except Exception as e:
+                print(f"Response cache DB unavailable at {db_path}, using memory only: {e}")
+                self._db = None
+
+    def _remember(self, key: str, value: Any, created_at: float) -> None:
+        self._entries[key] = (created_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _expired(self, created_at: float) -> bool:
+        return self.ttl_seconds is not None and time.time() - created_at > self.ttl_seconds
+
+    def _encode(self, value: Any) -> str:
+        if self.model_cls is not None:
+            return value.model_dump_json()
+        return json_dumps(value).decode("utf-8")
+
+    def _decode(self, raw: str) -> Any:
+        if self.model_cls is not None:
+            return self.model_cls.model_validate_json(raw)
+        return json_loads(raw)
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            if not self._expired(entry[0]):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            del self._entries[key]
+        if self._db is not None:
             try:
-                available_models = await fetch_ollama_model_names()
+                row = self._db.execute(
+                    f"SELECT value, created_at FROM {self.table} WHERE key = ?", (key,)
+                ).fetchone()
             except Exception as e:
-                raise HTTPException(
-                    status_code=503,
-                    detail=f"Ollama not reachable at {OLLAMA_HOST}. Error: {str(e)}"
-                )
+                print(f"Response cache DB read failed: {e}")
+                row = None
+            if row and not self._expired(row[1]):
+                value = self._decode(row[0])
+                self._remember(key, value, row[1])
+                self.hits += 1
+                return value
+        self.misses += 1
+        return None
 
-            if not available_models:
-                # Final fallback: attempt python client list directly
-                try:
-                    client = get_ollama_client()
-                    models = client.list()
-                    if isinstance(models, dict):
-                        for m in models.get("models", []) or []:
-                            name = None
-                            if isinstance(m, dict) and m.get("name"):
-                                name = m["name"]
-                            elif isinstance(m, str):
-                                name = m
-                            if name:
-                                available_models.append(name)
-                except Exception:
-                    pass
-
-            if not available_models:
-                raise HTTPException(
-                    status_code=503,
-                    detail=f"No Ollama models available at {OLLAMA_HOST}. Run: ollama pull llama3.1"
+    def put(self, key: str, value: Any) -> None:
+        created_at = time.time()
+        self._remember(key, value, created_at)
+        if self._db is not None:
+            try:
+                self._db.execute(
+                    f"INSERT OR REPLACE INTO {self.table} (key, value, created_at) VALUES (?, ?, ?)",
+                    (key, self._encode(value), created_at),
                 )
+                # Keep the DB bounded like the in-memory LRU (oldest rows go first)
+                self._db.execute(
+                    f"DELETE FROM {self.table} WHERE key NOT IN "
+                    f"(SELECT key FROM {self.table} ORDER BY created_at DESC LIMIT ?)",
+                    (self.max_entries,),
+                )
+                self._db.commit()
+            except Exception as e:
+                print(f"Response cache DB write failed: {e}")
 
-            model_name = pick_model(available_models)
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "persistent": self._db is not None,
+        }
 
-            # Call Ollama
-            client = get_ollama_client()
-            # Prefer JSON mode if supported by the client/version, otherwise fall back.
-            chat_kwargs = dict(
-                model=model_name,
-                messages=[
-                    {"role": "system", "content": SYSTEM_PROMPT},
-                    {"role": "user", "content": prompt},
-                ],
-                options={
-                    "temperature": 0.1,  # Low temperature for consistent extraction
-                    "num_predict": 4096,  # More headroom to avoid truncated JSON
-                },
+
+@lru_cache(maxsize=1)
+def conversion_cache_fingerprint() -> str:
+    """
+    Provider, model choice and system prompt the conversion runs with. Part of every cache key,
+    so switching models or editing the prompt doesn't serve results produced under the old setup.
+    """
+    use_claude = ANTHROPIC_API_KEY is not None and ANTHROPIC_API_KEY.strip() != ""
+    if CONVERTER_PROVIDER == "claude" or use_claude:
+        models = ",".join(ANTHROPIC_MODEL_FALLBACKS)
+    else:
+        models = f"ollama:{PREFERRED_OLLAMA_MODEL}:{'schema' if OLLAMA_STRUCTURED_OUTPUT else 'json'}"
+    return hashlib.sha256(f"{models}\0{SYSTEM_PROMPT}".encode("utf-8")).hexdigest()
+
+
+def conversion_cache_key(data_type: Optional[str], data: str) -> str:
+    """Hash what the conversion depends on: model/prompt fingerprint, dataType and the full input (long inputs are chunked, not trimmed)."""
+    digest = hashlib.sha256()
+    digest.update(conversion_cache_fingerprint().encode("utf-8"))
+    digest.update(b"\0")
+    digest.update((data_type or "").encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(data.encode("utf-8"))
+    return digest.hexdigest()
+
+
+conversion_exact_cache = ResponseCache(
+    max_entries=CONVERTER_CACHE_MAX,
+    db_path=CONVERTER_CACHE_DB,
+    ttl_seconds=CONVERTER_CACHE_TTL_SECONDS,
+    model_cls=ConversionResponse,
+)
+# Memory only, so values can be ConversionResponse models (or False for tables that didn't map to a schema)
+direct_parse_cache = ResponseCache(max_entries=DIRECT_PARSE_CACHE_MAX)
+extraction_cache = ResponseCache(max_entries=EXTRACTION_CACHE_MAX, ttl_seconds=CONVERTER_CACHE_TTL_SECONDS)
+
+
+async def cached_direct_csv_parse(text_data: str, data_type: Optional[str], dialect: Any) -> Optional[ConversionResponse]:
+    """
+    try_direct_csv_parse, memoized by a fingerprint of the content, dataType and dialect. Large tables
+    are parsed in a worker thread so the event loop keeps serving other requests meanwhile.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{data_type or ''}\0{dialect.delimiter}{dialect.quotechar}\0".encode("utf-8"))
+    digest.update(text_data.encode("utf-8", "ignore"))
+    key = digest.hexdigest()
+
+    cached = direct_parse_cache.get(key)
+    if cached is not None:
+        # Callers only set top-level fields (e.g. raw_content), so a shallow copy protects the entry
+        return cached.model_copy() if cached else None
+
+    if text_data.count("\n") >= NORMALIZE_THREAD_MIN_ITEMS:
+        result = await asyncio.to_thread(try_direct_csv_parse, text_data, data_type, dialect)
+    else:
+        result = try_direct_csv_parse(text_data, data_type, dialect)
+    direct_parse_cache.put(key, result.model_copy() if result else False)
+    return result
+
+
+class SemanticCache:
+    """
+    In-memory nearest-neighbour cache: entries are L2-normalized embeddings, so cosine
+    similarity is a plain dot product. Lookups only consider entries in the same namespace
+    (e.g. dataType) to avoid cross-type false hits. LRU eviction beyond max_entries.
+    """
+
+    def __init__(self, threshold: float, ttl_seconds: float, max_entries: int):
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[int, Tuple[str, List[float], float, Any]]" = OrderedDict()
+        self._next_id = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _unit(vector: List[float]) -> Optional[List[float]]:
+        norm = math.sqrt(sum(x * x for x in vector))
+        if not norm:
+            return None
+        return [x / norm for x in vector]
+
+    def get(self, namespace: str, vector: List[float]) -> Optional[Any]:
+        query = self._unit(vector)
+        if query is None:
+            return None
+        now = time.monotonic()
+        best_id, best_score = None, self.threshold
+        for entry_id, (ns, vec, expires_at, _value) in list(self._entries.items()):
+            if expires_at <= now:
+                del self._entries[entry_id]
+                continue
+            if ns != namespace or len(vec) != len(query):
+                continue
+            score = sum(map(operator.mul, vec, query))
+            if score >= best_score:
+                best_id, best_score = entry_id, score
+        if best_id is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(best_id)
+        self.hits += 1
+        return self._entries[best_id][3]
+
+    def put(self, namespace: str, vector: List[float], value: Any) -> None:
+        unit = self._unit(vector)
+        if unit is None:
+            return
+        self._entries[self._next_id] = (namespace, unit, time.monotonic() + self.ttl_seconds, value)
+        self._next_id += 1
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "threshold": self.threshold,
+        }
+
+
+conversion_semantic_cache = SemanticCache(
+    threshold=SEMANTIC_CACHE_THRESHOLD,
+    ttl_seconds=SEMANTIC_CACHE_TTL_SECONDS,
+    max_entries=SEMANTIC_CACHE_MAX,
+)
+
+
+async def semantic_cache_embedding(data: str) -> Optional[List[float]]:
+    """Embed a single-window model input for cache lookup; the cache is best-effort, so never raise."""
+    try:
+        return (await get_embeddings([data], "document", provider="ollama"))[0]
+    except Exception as e:
+        print(f"Semantic cache embedding failed, skipping cache: {e}")
+        return None
+
+
+@app.post("/convert", response_model=ConversionResponse)
+async def convert(request: ConversionRequest):
+    """
+    Convert unstructured data to structured format using Ollama
+    """
+    return model_json_response(await convert_data(request))
+
+
+# Model conversions running right now, by exact cache key: identical requests that arrive meanwhile
+# (a re-upload, duplicate /convert/batch items) await the same call instead of starting another
+_conversions_in_flight: Dict[str, "asyncio.Task[ConversionResponse]"] = {}
+
+
+async def convert_with_llm_once(request: ConversionRequest, key: Optional[str]) -> ConversionResponse:
+    """convert_with_llm, shared between concurrent callers with the same key (None: never shared)."""
+    if key is None:
+        return await convert_with_llm(request)
+    task = _conversions_in_flight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(convert_with_llm(request))
+        _conversions_in_flight[key] = task
+        task.add_done_callback(lambda _: _conversions_in_flight.pop(key, None))
+    # Shielded so one caller disconnecting doesn't cancel the others' result; each caller
+    # gets its own copy since they set top-level fields (e.g. raw_content) on it
+    return (await asyncio.shield(task)).model_copy()
+
+
+async def convert_data(request: ConversionRequest) -> ConversionResponse:
+    """Conversion shared by /convert, /convert-file and the validation endpoints."""
+    # Tables with recognizable headers are mapped deterministically; only fall through to the
+    # model when the headers are unknown or the input isn't tabular at all.
+    fmt = (request.format or "").lower()
+    dialect = None
+    if fmt in TABULAR_FORMATS:
+        dialect = csv.excel
+    elif fmt in ("", "text", "txt"):
+        dialect = detect_structured_csv(request.data)
+    if dialect is not None:
+        try:
+            direct_result = await cached_direct_csv_parse(request.data, request.dataType, dialect)
+            if direct_result:
+                return direct_result
+        except Exception as e:
+            # If direct CSV parsing fails, fall through to Ollama
+            print(f"Direct CSV parse failed, falling back to Ollama: {e}")
+
+    # Identical/near-duplicate uploads reuse an earlier LLM result instead of calling the model again
+    cache_namespace = request.dataType or "auto"
+    exact_key = None
+    cache_embedding = None
+    if not request.no_cache:
+        exact_key = conversion_cache_key(request.dataType, request.data)
+        cached = conversion_exact_cache.get(exact_key)
+        if cached is not None:
+            # Callers only set top-level fields (e.g. raw_content), so a shallow copy protects the entry
+            return cached.model_copy()
+    # One embedding can't stand for a chunked input: longer uploads differing past the first
+    # window would look identical, so they only use the exact cache
+    if SEMANTIC_CACHE_ENABLED and not request.no_cache and len(request.data) <= MAX_MODEL_INPUT_CHARS:
+        cache_embedding = await semantic_cache_embedding(request.data)
+        if cache_embedding:
+            cached = conversion_semantic_cache.get(cache_namespace, cache_embedding)
+            if cached is not None:
+                print(f"Semantic cache hit ({cache_namespace})")
+                return cached.model_copy()
+
+    result = await convert_with_llm_once(request, exact_key)
+    if result.startups or result.investors or result.mentors or result.corporates:
+        payload = result.model_copy()
+        if exact_key:
+            conversion_exact_cache.put(exact_key, payload)
+        if cache_embedding:
+            conversion_semantic_cache.put(cache_namespace, cache_embedding, payload)
+    return result
+
+
+def conversion_error_detail(error: Exception) -> str:
+    """User-facing message for a conversion that raised."""
+    return str(error.detail) if isinstance(error, HTTPException) else f"Conversion failed: {error}"
+
+
+async def convert_data_many(requests: List[ConversionRequest], concurrency: int = CONVERT_BATCH_CONCURRENCY) -> List[ConversionResponse]:
+    """
+    Run convert_data over many inputs concurrently (the model calls are network-bound), at most
+    `concurrency` at a time. A failed item becomes an error result instead of failing the batch.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def convert_one(request: ConversionRequest) -> ConversionResponse:
+        async with semaphore:
+            return await convert_data(request)
+
+    outcomes = await asyncio.gather(*(convert_one(request) for request in requests), return_exceptions=True)
+    results = []
+    for outcome in outcomes:
+        if isinstance(outcome, BaseException):
+            if not isinstance(outcome, Exception):
+                raise outcome  # cancellation / shutdown
+            outcome = ConversionResponse(detectedType="unknown", confidence=0.0, errors=[conversion_error_detail(outcome)])
+        results.append(outcome)
+    return results
+
+
+@app.post("/convert/batch", response_model=ConversionBatchResponse)
+async def convert_batch(request: ConversionBatchRequest):
+    """Convert several independent inputs in one call; results come back in request order."""
+    if not request.items:
+        raise HTTPException(status_code=400, detail="items must be a non-empty list.")
+    if len(request.items) > CONVERT_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many items ({len(request.items)}); send at most {CONVERT_BATCH_MAX_ITEMS} per batch."
+        )
+    results = await convert_data_many(request.items)
+    return model_json_response(ConversionBatchResponse(results=results))
+
+
+# Keys that mark an LLM-returned item as a given record type (auto-detect when no dataType is given)
+_DETECT_STARTUP_KEYS = frozenset(('companyName', 'fundingTarget', 'fundingStage'))
+_DETECT_INVESTOR_KEYS = frozenset(('firmName', 'minTicketSize', 'maxTicketSize', 'memberName'))
+_DETECT_MENTOR_KEYS = frozenset(('fullName', 'Full Name', 'expertiseAreas', 'Expertise Areas'))
+_DETECT_MENTOR_NAME_KEYS = frozenset(('fullName', 'Full Name'))
+_DETECT_EMAIL_KEYS = frozenset(('email', 'Email'))
+_DETECT_CORPORATE_KEYS = frozenset(('contactName', 'Contact Name', 'partnershipTypes', 'Partnership Types'))
+_DETECT_CONTACT_KEYS = frozenset(('contactName', 'Contact Name'))
+
+
+def ensure_list(value: Any) -> List[Any]:
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return value
+    return [value]
+
+
+def coerce_to_buckets(
+    parsed_data: Any, data_type: Optional[str]
+) -> Tuple[Dict[str, List[Dict[str, Any]]], List[str], Optional[str]]:
+    """
+    Sort parsed model output into {"startups", "investors", "mentors", "corporates"} item lists.
+    Returns (buckets, warnings, detected_type); detected_type is None for wrapper objects, whose
+    type is whatever the buckets turn out to contain.
+    """
+    buckets: Dict[str, List[Dict[str, Any]]] = {"startups": [], "investors": [], "mentors": [], "corporates": []}
+    warnings: List[str] = []
+
+    # If the model returns a wrapper object (common), unwrap it.
+    # Supported shapes:
+    # - { startups: [...], investors: [...] }
+    # - { data: [...] }
+    # - { detectedType: "...", investors: [...] } etc.
+    if isinstance(parsed_data, dict):
+        wrapper = parsed_data
+        # Direct "data" wrapper
+        if isinstance(wrapper.get("data"), list):
+            parsed_data = wrapper["data"]
+        # Direct "startups"/"investors" wrapper: items are already grouped by type
+        elif isinstance(wrapper.get("startups"), (list, dict)) or isinstance(wrapper.get("investors"), (list, dict)):
+            for name, items in buckets.items():
+                items.extend(item for item in ensure_list(wrapper.get(name)) if isinstance(item, dict))
+            return buckets, warnings, None
+        # Fallback: treat wrapper as a single item
+        else:
+            parsed_data = [wrapper]
+
+    detected_type = data_type or "unknown"
+    for item in parsed_data:
+        # Skip non-dict items to avoid type errors
+        if not isinstance(item, dict):
+            warnings.append(f"Skipping non-dict item: {item}")
+            continue
+        keys = item.keys()
+        # Auto-detect type if not specified
+        if not data_type:
+            has_startup_fields = not _DETECT_STARTUP_KEYS.isdisjoint(keys)
+            has_investor_fields = not _DETECT_INVESTOR_KEYS.isdisjoint(keys)
+            has_mentor_fields = not _DETECT_MENTOR_KEYS.isdisjoint(keys) and not _DETECT_EMAIL_KEYS.isdisjoint(keys)
+            has_corporate_fields = not _DETECT_CORPORATE_KEYS.isdisjoint(keys)
+            
+            if has_mentor_fields:
+                detected_type = "mentor"
+            elif has_corporate_fields:
+                detected_type = "corporate"
+            elif has_startup_fields and not has_investor_fields:
+                detected_type = "startup"
+            elif has_investor_fields and not has_startup_fields:
+                detected_type = "investor"
+            elif has_startup_fields and has_investor_fields:
+                # Ambiguous - check more indicators
+                if 'companyName' in item and 'fundingTarget' in item:
+                    detected_type = "startup"
+                else:
+                    detected_type = "investor"
+        
+        # Bin based on detected type
+        if detected_type == "startup" or (not data_type and 'companyName' in item):
+            buckets["startups"].append(item)
+        elif detected_type == "mentor" or (not data_type and not _DETECT_MENTOR_NAME_KEYS.isdisjoint(keys)):
+            buckets["mentors"].append(item)
+        elif detected_type == "corporate" or (not data_type and not _DETECT_CONTACT_KEYS.isdisjoint(keys)):
+            buckets["corporates"].append(item)
+        elif detected_type == "investor" or (not data_type and 'firmName' in item):
+            buckets["investors"].append(item)
+        else:
+            warnings.append(f"Could not determine type for item: {item}")
+    return buckets, warnings, detected_type
+
+
+def normalize_bucket(kind: str, items: List[Dict[str, Any]]) -> Tuple[List[Any], List[str], List[str]]:
+    """Normalize one bucket of model-output items of a single type; returns (records, warnings, errors)."""
+    records: List[Any] = []
+    warnings: List[str] = []
+    errors: List[str] = []
+    for item in items:
+        try:
+            if kind == "startup":
+                startup = normalize_startup_data(item)
+                if startup.companyName:
+                    records.append(startup)
+            elif kind == "mentor":
+                mentor = normalize_mentor_data(item)
+                if mentor.fullName and mentor.email:
+                    records.append(mentor)
+                elif mentor.fullName:
+                    warnings.append(f"Mentor '{mentor.fullName}' missing email, skipping")
+            elif kind == "corporate":
+                corporate = normalize_corporate_data(item)
+                if corporate.firmName and corporate.contactName:
+                    records.append(corporate)
+                elif corporate.firmName:
+                    warnings.append(f"Corporate '{corporate.firmName}' missing contact name, skipping")
+            else:
+                investor = normalize_investor_data(item)
+                if investor.firmName:
+                    # Some sources (esp. PDFs) list only firm names without a specific person.
+                    # Don't hard-fail the whole conversion; fill a placeholder and warn.
+                    if not investor.memberName:
+                        investor = investor.model_copy(update={"memberName": "UNKNOWN"})
+                        warnings.append(
+                            f"Investor missing memberName; using placeholder 'UNKNOWN' for firm '{investor.firmName}'."
+                        )
+                    records.append(investor)
+        except Exception as e:
+            errors.append(f"Error processing {kind} item: {str(e)}")
+    return records, warnings, errors
+
+
+async def extract_with_model(data: str, data_type: Optional[str]) -> Any:
+    """One model call (Claude or Ollama) over `data`; returns the parsed JSON output."""
+    prompt = create_conversion_prompt(data, data_type)
+
+    # Decide which provider to use
+    use_claude = ANTHROPIC_API_KEY is not None and ANTHROPIC_API_KEY.strip() != ""
+    if CONVERTER_PROVIDER == "claude" or use_claude:
+        response_text = await call_anthropic(prompt)
+        try:
+            parsed_data = parse_ollama_response(response_text)
+        except Exception:
+            retry_prompt = (
+                "Return ONLY valid JSON. Do not include markdown or explanations. "
+                "Restart the JSON from scratch and ensure all brackets are closed.\n\n"
+                + create_conversion_prompt(data, data_type)
             )
+            retry_text = await call_anthropic(retry_prompt)
+            parsed_data = parse_ollama_response(retry_text)
+    else:
+        model_name = await resolve_ollama_model()
+
+        # Call Ollama
+        client = get_ollama_client()
+        # Structured output: Ollama constrains decoding to the schema, so the reply is valid,
+        # bucketed JSON on the first try. Older clients without a format argument fall back.
+        chat_kwargs = dict(
+            model=model_name,
+            messages=[SYSTEM_MESSAGE, {"role": "user", "content": prompt}],
+            options={
+                "temperature": 0.1,  # Low temperature for consistent extraction
+                "num_predict": 4096,  # More headroom to avoid truncated JSON
+            },
+            keep_alive=OLLAMA_KEEP_ALIVE,
+        )
+        output_format = CONVERSION_OUTPUT_SCHEMA if OLLAMA_STRUCTURED_OUTPUT else "json"
+        schema_constrained = OLLAMA_STRUCTURED_OUTPUT
+        try:
             try:
-                response = client.chat(**chat_kwargs, format="json")
+                response = await ollama_chat_with_retry(client, **chat_kwargs, format=output_format)
             except TypeError:
-                response = client.chat(**chat_kwargs)
+                response = await ollama_chat_with_retry(client, **chat_kwargs)
+                schema_constrained = False
+        except ollama.ResponseError as e:
+            forget_missing_ollama_model(e)
+            raise
 
-            # Extract response content
-            response_text = response.get('message', {}).get('content')
-            if not isinstance(response_text, str):
-                raise HTTPException(status_code=502, detail="Ollama returned empty content. Ensure the model is available and retry.")
+        # Extract response content
+        response_text = response.get('message', {}).get('content')
+        if not isinstance(response_text, str) or not response_text.strip():
+            raise HTTPException(status_code=502, detail="Ollama returned empty content. Ensure the model is available and retry.")
 
-            # Parse JSON from response (retry once if model output is truncated/non-JSON)
-            try:
-                parsed_data = parse_ollama_response(response_text)
-            except Exception:
-                # Retry with a stricter prompt and higher output budget
-                retry_prompt = (
-                    "Return ONLY valid JSON. Do not include markdown or explanations. "
-                    "Restart the JSON from scratch and ensure all brackets are closed.\n\n"
-                    + create_conversion_prompt(request.data, request.dataType)
-                )
-                retry_kwargs = dict(
-                    model=model_name,
-                    messages=[
-                        {"role": "system", "content": SYSTEM_PROMPT},
-                        {"role": "user", "content": retry_prompt},
-                    ],
-                    options={
-                        "temperature": 0.0,
-                        "num_predict": 8192,
-                    },
+        try:
+            parsed_data = parse_ollama_response(response_text)
+        except Exception:
+            if schema_constrained:
+                # Schema-constrained output only fails to parse when it hit num_predict mid-object,
+                # so asking again would just truncate again
+                raise HTTPException(
+                    status_code=502,
+                    detail="Ollama returned incomplete JSON (output likely truncated). Retry with a smaller input."
                 )
+            # Unconstrained output: retry once with a stricter prompt and a higher output budget
+            retry_prompt = (
+                "Return ONLY valid JSON. Do not include markdown or explanations. "
+                "Restart the JSON from scratch and ensure all brackets are closed.\n\n"
+                + prompt
+            )
+            retry_kwargs = dict(
+                model=model_name,
+                messages=[SYSTEM_MESSAGE, {"role": "user", "content": retry_prompt}],
+                options={
+                    "temperature": 0.0,
+                    "num_predict": 8192,
+                },
+                keep_alive=OLLAMA_KEEP_ALIVE,
+            )
+            try:
                 try:
-                    retry_res = client.chat(**retry_kwargs, format="json")
+                    retry_res = await ollama_chat_with_retry(client, **retry_kwargs, format="json")
                 except TypeError:
-                    retry_res = client.chat(**retry_kwargs)
-                retry_text = retry_res.get("message", {}).get("content")
-                if not isinstance(retry_text, str):
-                    raise HTTPException(status_code=502, detail="Ollama returned empty content on retry.")
-                parsed_data = parse_ollama_response(retry_text)
-        
-        # If the model returns a wrapper object (common), unwrap it.
-        # Supported shapes:
-        # - { startups: [...], investors: [...] }
-        # - { data: [...] }
-        # - { detectedType: "...", investors: [...] } etc.
-        if isinstance(parsed_data, dict):
-            wrapper = parsed_data
-
-            # Direct "data" wrapper
-            if isinstance(wrapper.get("data"), list):
-                parsed_data = wrapper["data"]
-            # Direct "startups"/"investors" wrapper: bypass generic detection loop
-            elif isinstance(wrapper.get("startups"), (list, dict)) or isinstance(wrapper.get("investors"), (list, dict)):
-                startups = []
-                investors = []
-                mentors = []
-                corporates = []
-                warnings = []
-                errors = []
-
-                def ensure_list(v: Any) -> List[Any]:
-                    if v is None:
-                        return []
-                    if isinstance(v, list):
-                        return v
-                    return [v]
-
-                for item in ensure_list(wrapper.get("startups")):
-                    if isinstance(item, dict):
-                        try:
-                            s = normalize_startup_data(item)
-                            if s.companyName:
-                                startups.append(s)
-                        except Exception as e:
-                            errors.append(f"Error processing startup item: {str(e)}")
-
-                for item in ensure_list(wrapper.get("investors")):
-                    if isinstance(item, dict):
-                        try:
-                            inv = normalize_investor_data(item)
-                            if inv.firmName:
-                                if not inv.memberName:
-                                    inv.memberName = "UNKNOWN"
-                                    warnings.append(
-                                        f"Investor missing memberName; using placeholder 'UNKNOWN' for firm '{inv.firmName}'."
-                                    )
-                                investors.append(inv)
-                        except Exception as e:
-                            errors.append(f"Error processing investor item: {str(e)}")
-
-                for item in ensure_list(wrapper.get("mentors")):
-                    if isinstance(item, dict):
-                        try:
-                            mentor = normalize_mentor_data(item)
-                            if mentor.fullName and mentor.email:
-                                mentors.append(mentor)
-                        except Exception as e:
-                            errors.append(f"Error processing mentor item: {str(e)}")
-
-                for item in ensure_list(wrapper.get("corporates")):
-                    if isinstance(item, dict):
-                        try:
-                            corp = normalize_corporate_data(item)
-                            if corp.firmName and corp.contactName:
-                                corporates.append(corp)
-                        except Exception as e:
-                            errors.append(f"Error processing corporate item: {str(e)}")
-
-                # Determine detected type
-                types_found = []
-                if startups:
-                    types_found.append("startup")
-                if investors:
-                    types_found.append("investor")
-                if mentors:
-                    types_found.append("mentor")
-                if corporates:
-                    types_found.append("corporate")
-                
-                detected_type = "+".join(types_found) if types_found else "unknown"
-                
-                if not (startups or investors or mentors or corporates):
-                    errors.append("No valid data extracted. Please check the input format and column names.")
-
-                return ConversionResponse(
-                    startups=startups,
-                    investors=investors,
-                    mentors=mentors,
-                    corporates=corporates,
-                    detectedType=detected_type,
-                    confidence=0.8 if (startups or investors) else 0.0,
-                    warnings=warnings,
-                    errors=errors,
-                )
+                    retry_res = await ollama_chat_with_retry(client, **retry_kwargs)
+            except ollama.ResponseError as e:
+                forget_missing_ollama_model(e)
+                raise
+            retry_text = retry_res.get("message", {}).get("content")
+            if not isinstance(retry_text, str) or not retry_text.strip():
+                raise HTTPException(status_code=502, detail="Ollama returned empty content on retry.")
+            parsed_data = parse_ollama_response(retry_text)
+    return parsed_data
+
+
+async def extract_chunks_with_model(
+    chunks: List[str], data_type: Optional[str]
+) -> Tuple[Dict[str, List[Dict[str, Any]]], List[str], Optional[str]]:
+    """
+    extract_with_model over every chunk concurrently (CONVERT_BATCH_CONCURRENCY at a time), pooled into
+    one set of buckets. A chunk that fails only loses its own items, unless every chunk fails.
+    """
+    semaphore = asyncio.Semaphore(CONVERT_BATCH_CONCURRENCY)
+
+    async def extract_chunk(chunk: str) -> Any:
+        async with semaphore:
+            return await extract_with_model(chunk, data_type)
+
+    outcomes = await asyncio.gather(*(extract_chunk(chunk) for chunk in chunks), return_exceptions=True)
+    failures = [outcome for outcome in outcomes if isinstance(outcome, BaseException)]
+    for failure in failures:
+        if not isinstance(failure, Exception):
+            raise failure  # cancellation / shutdown
+    if len(failures) == len(outcomes):
+        raise failures[0]
+
+    buckets: Dict[str, List[Dict[str, Any]]] = {"startups": [], "investors": [], "mentors": [], "corporates": []}
+    warnings = [f"Input was converted in {len(chunks)} chunks of up to {MAX_MODEL_INPUT_CHARS} characters."]
+    chunk_types = set()
+    for index, outcome in enumerate(outcomes, 1):
+        if isinstance(outcome, Exception):
+            warnings.append(f"Chunk {index}/{len(chunks)} was skipped: {conversion_error_detail(outcome)}")
+            continue
+        chunk_buckets, chunk_warnings, chunk_type = coerce_to_buckets(outcome, data_type)
+        for name, items in chunk_buckets.items():
+            buckets[name].extend(items)
+        warnings.extend(chunk_warnings)
+        chunk_types.add(chunk_type)
+    # Chunks can disagree (or come back empty): unless they all agree, the records decide the type
+    detected_type = chunk_types.pop() if len(chunk_types) == 1 else None
+    return buckets, warnings, detected_type
+
+
+# Fields that identify the same entity when it is extracted more than once (compared case-insensitively)
+_RECORD_IDENTITY_FIELDS = {
+    "startup": ("companyName",),
+    "investor": ("firmName", "memberName"),
+    "mentor": ("email",),
+    "corporate": ("firmName", "contactName"),
+}
+# Filled-in / missing values that don't identify anyone (several partners of one firm can all be "UNKNOWN")
+_PLACEHOLDER_IDENTITIES = {"", "unknown"}
+
+def dedupe_records(kind: str, records: List[Any]) -> List[Any]:
+    """
+    Drop repeated entities, keeping the first copy (e.g. rows seen in two overlapping chunks).
+    Records without a real identity (empty or placeholder key fields) are always kept.
+    """
+    fields = _RECORD_IDENTITY_FIELDS[kind]
+    seen = set()
+    unique = []
+    for record in records:
+        identity = tuple(getattr(record, field).strip().casefold() for field in fields)
+        if any(value in _PLACEHOLDER_IDENTITIES for value in identity):
+            unique.append(record)
+        elif identity not in seen:
+            seen.add(identity)
+            unique.append(record)
+    return unique
+
+
+async def convert_with_llm(request: ConversionRequest) -> ConversionResponse:
+    """Convert via Claude or Ollama and normalize the model output."""
+    try:
+        chunks, truncated = split_model_input(request.data)
+        if len(chunks) == 1:
+            parsed_data = await extract_with_model(chunks[0], request.dataType)
+            buckets, warnings, detected_type = coerce_to_buckets(parsed_data, request.dataType)
+        else:
+            buckets, warnings, detected_type = await extract_chunks_with_model(chunks, request.dataType)
+        if truncated:
+            warnings.append(
+                f"Input exceeded {MAX_MODEL_INPUT_CHUNKS} chunks of {MAX_MODEL_INPUT_CHARS} characters; the remainder was not converted."
+            )
 
-            # Fallback: treat wrapper as a single item
-            else:
-                parsed_data = [wrapper]
-        # Normalize to list if single object
-        elif isinstance(parsed_data, dict):
-            parsed_data = [parsed_data]
-        
-        # Convert to structured format
-        startups = []
-        investors = []
-        mentors = []
-        corporates = []
-        warnings = []
+        # One pass per record type; large outputs are normalized in worker threads so the
+        # event loop keeps serving other requests meanwhile
+        kinds = ("startup", "investor", "mentor", "corporate")
+        if sum(len(items) for items in buckets.values()) >= NORMALIZE_THREAD_MIN_ITEMS:
+            results = await asyncio.gather(
+                *(asyncio.to_thread(normalize_bucket, kind, buckets[kind + "s"]) for kind in kinds)
+            )
+        else:
+            results = [normalize_bucket(kind, buckets[kind + "s"]) for kind in kinds]
+        (startups, _, _), (investors, _, _), (mentors, _, _), (corporates, _, _) = results
+        if len(chunks) > 1:
+            # Records inside a chunk overlap are extracted twice
+            deduped = [dedupe_records(kind, records) for kind, (records, _, _) in zip(kinds, results)]
+            dropped = sum(len(records) for records, _, _ in results) - sum(len(records) for records in deduped)
+            startups, investors, mentors, corporates = deduped
+            if dropped:
+                warnings.append(f"Merged {dropped} duplicate record(s) repeated across overlapping chunks.")
         errors = []
-        detected_type = request.dataType or "unknown"
-        
-        for item in parsed_data:
-            # Skip non-dict items to avoid type errors
-            if not isinstance(item, dict):
-                warnings.append(f"Skipping non-dict item: {item}")
-                continue
-            try:
-                # Auto-detect type if not specified
-                if not request.dataType:
-                    has_startup_fields = any(k in item for k in ['companyName', 'fundingTarget', 'fundingStage'])
-                    has_investor_fields = any(k in item for k in ['firmName', 'minTicketSize', 'maxTicketSize', 'memberName'])
-                    has_mentor_fields = any(k in item for k in ['fullName', 'Full Name', 'expertiseAreas', 'Expertise Areas']) and any(k in item for k in ['email', 'Email'])
-                    has_corporate_fields = any(k in item for k in ['contactName', 'Contact Name', 'partnershipTypes', 'Partnership Types'])
-                    
-                    if has_mentor_fields:
-                        detected_type = "mentor"
-                    elif has_corporate_fields:
-                        detected_type = "corporate"
-                    elif has_startup_fields and not has_investor_fields:
-                        detected_type = "startup"
-                    elif has_investor_fields and not has_startup_fields:
-                        detected_type = "investor"
-                    elif has_startup_fields and has_investor_fields:
-                        # Ambiguous - check more indicators
-                        if 'companyName' in item and 'fundingTarget' in item:
-                            detected_type = "startup"
-                        else:
-                            detected_type = "investor"
-                
-                # Convert based on detected type
-                if detected_type == "startup" or (not request.dataType and 'companyName' in item):
-                    startup = normalize_startup_data(item)
-                    if startup.companyName:
-                        startups.append(startup)
-                elif detected_type == "mentor" or (not request.dataType and any(k in item for k in ['fullName', 'Full Name'])):
-                    mentor = normalize_mentor_data(item)
-                    if mentor.fullName and mentor.email:
-                        mentors.append(mentor)
-                    elif mentor.fullName:
-                        warnings.append(f"Mentor '{mentor.fullName}' missing email, skipping")
-                elif detected_type == "corporate" or (not request.dataType and any(k in item for k in ['contactName', 'Contact Name'])):
-                    corporate = normalize_corporate_data(item)
-                    if corporate.firmName and corporate.contactName:
-                        corporates.append(corporate)
-                    elif corporate.firmName:
-                        warnings.append(f"Corporate '{corporate.firmName}' missing contact name, skipping")
-                elif detected_type == "investor" or (not request.dataType and 'firmName' in item):
-                    investor = normalize_investor_data(item)
-                    if investor.firmName:
-                        # Some sources (esp. PDFs) list only firm names without a specific person.
-                        # Don't hard-fail the whole conversion; fill a placeholder and warn.
-                        if not investor.memberName:
-                            investor.memberName = "UNKNOWN"
-                            warnings.append(
-                                f"Investor missing memberName; using placeholder 'UNKNOWN' for firm '{investor.firmName}'."
-                            )
-                        investors.append(investor)
-                else:
-                    warnings.append(f"Could not determine type for item: {item}")
-            except Exception as e:
-                errors.append(f"Error processing item: {str(e)}")
+        for _, bucket_warnings, bucket_errors in results:
+            warnings.extend(bucket_warnings)
+            errors.extend(bucket_errors)
+
+        if detected_type is None:
+            # Wrapper objects can mix types: report every type that produced records
+            types_found = [
+                kind for kind, records in (
+                    ("startup", startups), ("investor", investors), ("mentor", mentors), ("corporate", corporates)
+                ) if records
+            ]
+            detected_type = "+".join(types_found) if types_found else "unknown"
         
         if not (startups or investors or mentors or corporates):
             errors.append("No valid data extracted. Please check the input format and column names.")
@@ -2045,120 +3181,85 @@ async def convert_data(request: ConversionRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Conversion failed: {str(e)}")
 
-def validate_structured_rows(
-    startups: List[StartupData], 
-    investors: List[InvestorData],
-    mentors: List[MentorData] = None,
-    corporates: List[CorporateData] = None
-) -> List[str]:
-    """
-    Row-level validation with explicit row numbers and missing fields.
-    """
-    errors: List[str] = []
+class _CsvLineSink:
+    """File-like target for csv writers: writerow() returns what write() returns, i.e. the formatted line."""
+
+    @staticmethod
+    def write(line: str) -> str:
+        return line
+
+
+# (CSV header, model attribute) per template column
+_STARTUP_CSV_COLUMNS = (
+    ("company_name", "companyName"),
+    ("geo_markets", "geoMarkets"),
+    ("industry", "industry"),
+    ("funding_target", "fundingTarget"),
+    ("funding_stage", "fundingStage"),
+)
+_INVESTOR_CSV_COLUMNS = (
+    ("firm_name", "firmName"),
+    ("investment_member", "memberName"),
+    ("geo_focus", "geoFocus"),
+    ("industry_preferences", "industryPreferences"),
+    ("min_ticket_size", "minTicketSize"),
+    ("max_ticket_size", "maxTicketSize"),
+    ("total_slots", "totalSlots"),
+    ("table_number", "tableNumber"),
+)
 
-    for idx, s in enumerate(startups, start=1):
-        missing = []
-        if not s.companyName:
-            missing.append("companyName")
-        # NOTE: We intentionally do NOT hard-require every field here.
-        # Many PDFs / unstructured sources omit fields like stage/geo/ticket size.
-        # The UI supports editing later; blocking imports is worse UX.
-        if missing:
-            errors.append(f"Startup row {idx}: missing {', '.join(missing)}")
-
-    for idx, inv in enumerate(investors, start=1):
-        missing = []
-        if not inv.firmName:
-            missing.append("firmName")
-        if not inv.memberName:
-            missing.append("memberName")
-        # Do not require geoFocus/industryPreferences/stagePreferences/ticket sizes here.
-        if missing:
-            errors.append(f"Investor row {idx}: missing {', '.join(missing)}")
-
-    for idx, mentor in enumerate(mentors or [], start=1):
-        missing = []
-        if not mentor.fullName:
-            missing.append("fullName")
-        if not mentor.email:
-            missing.append("email")
-        if missing:
-            errors.append(f"Mentor row {idx}: missing {', '.join(missing)}")
-
-    for idx, corp in enumerate(corporates or [], start=1):
-        missing = []
-        if not corp.firmName:
-            missing.append("firmName")
-        if not corp.contactName:
-            missing.append("contactName")
-        if missing:
-            errors.append(f"Corporate row {idx}: missing {', '.join(missing)}")
-
-    return errors
+
+def csv_cell(value: Any) -> Any:
+    """Template cell: lists joined with "; ", None as empty."""
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        # Most list cells are empty or single-valued; those skip the join call
+        if len(value) < 2:
+            return value[0] if value else ""
+        return "; ".join(value)
+    return value
+
+
+def iter_records_csv(columns: Tuple[Tuple[str, str], ...], records: List[Any]) -> Iterator[str]:
+    """Yield a header line, then one CSV line per record (usable as a StreamingResponse body)."""
+    # One attrgetter pulls every column of a record in a single call, positionally
+    get_row = operator.attrgetter(*(attr for _, attr in columns))
+    writer = csv.writer(_CsvLineSink())
+    yield writer.writerow([header for header, _ in columns])
+    for record in records:
+        yield writer.writerow([csv_cell(value) for value in get_row(record)])
+
+def iter_startup_csv(startups: List[StartupData]) -> Iterator[str]:
+    return iter_records_csv(_STARTUP_CSV_COLUMNS, startups)
 
 def build_startup_csv(startups: List[StartupData]) -> str:
-    headers = ["company_name", "geo_markets", "industry", "funding_target", "funding_stage"]
-    output = StringIO()
-    writer = csv.DictWriter(output, fieldnames=headers)
-    writer.writeheader()
-    for s in startups:
-        writer.writerow({
-            "company_name": s.companyName or "",
-            "geo_markets": "; ".join(s.geoMarkets) if s.geoMarkets else "",
-            "industry": s.industry or "",
-            "funding_target": s.fundingTarget if s.fundingTarget is not None else "",
-            "funding_stage": s.fundingStage or "",
-        })
-    return output.getvalue()
+    return "".join(iter_startup_csv(startups))
+
+def iter_investor_csv(investors: List[InvestorData]) -> Iterator[str]:
+    return iter_records_csv(_INVESTOR_CSV_COLUMNS, investors)
 
 def build_investor_csv(investors: List[InvestorData]) -> str:
-    headers = [
-        "firm_name",
-        "investment_member",
-        "geo_focus",
-        "industry_preferences",
-        "min_ticket_size",
-        "max_ticket_size",
-        "total_slots",
-        "table_number",
-    ]
-    output = StringIO()
-    writer = csv.DictWriter(output, fieldnames=headers)
-    writer.writeheader()
-    for inv in investors:
-        writer.writerow({
-            "firm_name": inv.firmName or "",
-            "investment_member": inv.memberName or "",
-            "geo_focus": "; ".join(inv.geoFocus) if inv.geoFocus else "",
-            "industry_preferences": "; ".join(inv.industryPreferences) if inv.industryPreferences else "",
-            "min_ticket_size": inv.minTicketSize if inv.minTicketSize is not None else "",
-            "max_ticket_size": inv.maxTicketSize if inv.maxTicketSize is not None else "",
-            "total_slots": inv.totalSlots if inv.totalSlots is not None else "",
-            "table_number": inv.tableNumber or "",
-        })
-    return output.getvalue()
+    return "".join(iter_investor_csv(investors))
 
-@app.post("/convert-file")
+@app.post("/convert-file", response_model=ConversionResponse)
 async def convert_file(file: UploadFile = File(...), dataType: Optional[str] = None):
     """Convert uploaded file (CSV, text, PDF, etc.)"""
     try:
-        file_ext, text_content = await extract_text_content(file)
+        file_ext, text_content = await extract_text_cached(file)
         request = ConversionRequest(
             data=text_content,
             dataType=dataType,
             format=file_ext
         )
         conversion_result = await convert_data(request)
-        # Include extracted text for downstream indexing (truncate to control payload size)
-        conversion_result.raw_content = text_content[:MAX_MODEL_INPUT_CHARS]
-
-        # Validate critical identifiers, but don't hard-fail if optional fields are missing.
-        row_errors = validate_structured_rows(
-            conversion_result.startups, 
-            conversion_result.investors,
-            conversion_result.mentors,
-            conversion_result.corporates
-        )
+        # Include extracted text for downstream indexing (truncated to what the model converts,
+        # to control payload size)
+        conversion_result.raw_content = text_content[:MAX_MODEL_INPUT_CHARS * MAX_MODEL_INPUT_CHUNKS]
+
+        # No second validation pass over the rows: convert_data only returns records whose
+        # identifying fields are filled (normalize_bucket and the direct-CSV finalizers drop or
+        # patch the rest while the records are built).
 
         # Block only if nothing was extracted
         has_any_data = (
@@ -2173,33 +3274,28 @@ async def convert_file(file: UploadFile = File(...), dataType: Optional[str] = N
             conversion_result.errors = (conversion_result.errors or []) + [
                 "No valid data extracted. Please check the input format and column names. Expected columns for Investors: firmName, memberName, geoFocus, industryPreferences, stagePreferences. For Mentors: fullName, email, geoFocus. For Corporates: firmName, contactName, geoFocus, partnershipTypes."
             ]
-            return conversion_result
-
-        # Surface missing critical fields as warnings so users can import and edit in the UI.
-        if row_errors:
-            conversion_result.warnings = (conversion_result.warnings or []) + row_errors
+            return model_json_response(conversion_result)
 
-        return conversion_result
+        return model_json_response(conversion_result)
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"File conversion failed: {str(e)}")
 
+# One alternation scans the URL once for every supported Drive URL shape (including open?id=FILE_ID)
+_DRIVE_URL_RE = re.compile(
+    r"https?://docs\.google\.com/(?P<doc>document|presentation|spreadsheets)/d/(?P<doc_id>[^/]+)"
+    r"|https?://drive\.google\.com/file/d/(?P<file_id>[^/]+)"
+    r"|[?&]id=(?P<query_id>[^&]+)"
+)
+_DRIVE_DOC_KINDS = {"document": "document", "presentation": "presentation", "spreadsheets": "spreadsheet"}
+
 def parse_google_drive_url(url: str) -> Tuple[str, str]:
-    patterns = [
-        ("document", r"https?://docs\.google\.com/document/d/([^/]+)"),
-        ("presentation", r"https?://docs\.google\.com/presentation/d/([^/]+)"),
-        ("spreadsheet", r"https?://docs\.google\.com/spreadsheets/d/([^/]+)"),
-        ("drive", r"https?://drive\.google\.com/file/d/([^/]+)"),
-    ]
-    for kind, pattern in patterns:
-        match = re.search(pattern, url)
-        if match:
-            return kind, match.group(1)
-    # Alternate Drive URL pattern: open?id=FILE_ID
-    match = re.search(r"[?&]id=([^&]+)", url)
+    match = _DRIVE_URL_RE.search(url)
     if match:
-        return "drive", match.group(1)
+        if match.group("doc"):
+            return _DRIVE_DOC_KINDS[match.group("doc")], match.group("doc_id")
+        return "drive", match.group("file_id") or match.group("query_id")
     raise HTTPException(status_code=400, detail="Unsupported Google Drive URL format.")
 
 @app.post("/ingest/clickup", response_model=ClickUpIngestResponse)
@@ -2215,11 +3311,11 @@ async def ingest_clickup(request: ClickUpIngestRequest):
     params = {"include_closed": "true" if request.include_closed else "false"}
     headers = {"Authorization": CLICKUP_API_TOKEN}
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        res = await client.get(url, headers=headers, params=params)
-        if res.status_code >= 400:
-            raise HTTPException(status_code=res.status_code, detail=res.text[:400])
-        data = res.json()
+    client = get_external_http()
+    res = await client.get(url, headers=headers, params=params)
+    if res.status_code >= 400:
+        raise HTTPException(status_code=res.status_code, detail=res.text[:400])
+    data = json_loads(res.content)
 
     tasks = []
     for task in data.get("tasks", []):
@@ -2247,11 +3343,11 @@ async def list_clickup_lists(request: ClickUpListsRequest):
     url = f"https://api.clickup.com/api/v2/team/{team_id}/list"
     headers = {"Authorization": CLICKUP_API_TOKEN}
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        res = await client.get(url, headers=headers, params={"archived": "false"})
-        if res.status_code >= 400:
-            raise HTTPException(status_code=res.status_code, detail=res.text[:400])
-        data = res.json()
+    client = get_external_http()
+    res = await client.get(url, headers=headers, params={"archived": "false"})
+    if res.status_code >= 400:
+        raise HTTPException(status_code=res.status_code, detail=res.text[:400])
+    data = json_loads(res.content)
 
     lists = []
     for item in data.get("lists", []):
@@ -2262,81 +3358,82 @@ async def list_clickup_lists(request: ClickUpListsRequest):
 
     return ClickUpListsResponse(lists=lists)
 
-async def stream_anthropic_answer(prompt: str, question: str = "", sources: List[AskSource] = None) -> AsyncGenerator[str, None]:
+async def stream_anthropic_answer(prompt: str, question: str = "", sources: List[AskSource] = None) -> AsyncGenerator[bytes, None]:
     """
     Stream Claude's response token by token for ChatGPT-like experience.
+    Yields one JSON event body per delta as bytes, ready to frame as SSE.
     """
     if not ANTHROPIC_API_KEY:
-        yield json.dumps({"error": "ANTHROPIC_API_KEY not set"})
+        yield json_dumps({"error": "ANTHROPIC_API_KEY not set"})
         return
 
-    headers = {
-        "Content-Type": "application/json",
-        "x-api-key": ANTHROPIC_API_KEY,
-        "anthropic-version": "2023-06-01",
-    }
+    headers = get_anthropic_headers()
     url = get_anthropic_api_url()
     default_url = "https://api.anthropic.com/v1/messages"
+    system_prompt = get_answer_system_prompt(question)
 
     # Choose model based on question complexity
     use_haiku = question and sources and is_simple_question(question, sources)
     model_list = ([HAIKU_MODEL] + ANTHROPIC_MODEL_FALLBACKS) if use_haiku else ANTHROPIC_MODEL_FALLBACKS
     max_tokens = 250 if use_haiku else ASK_MAX_TOKENS
 
-    async with httpx.AsyncClient(timeout=60.0) as client:
-        for model_name in [m for m in model_list if m]:
-            payload = {
-                "model": model_name,
-                "max_tokens": max_tokens,
-                "temperature": 0.1,
-                "stream": True,  # Enable streaming
-                "system": "You are Orbit AI, a VC intelligence system. You answer questions STRICTLY from provided sources only. Never use general knowledge. If information isn't in the sources, say so explicitly. Always cite sources with [1], [2], etc.",
-                "messages": [
-                    {"role": "user", "content": prompt}
-                ],
-            }
+    client = get_anthropic_http()
+    candidates = anthropic_models_to_try(model_list)
+    for model_name in candidates:
+        body = build_anthropic_body(model_name, prompt, system_prompt, max_tokens=max_tokens, temperature=0.1)
 
-            try:
-                async with client.stream("POST", url, headers=headers, json=payload) as response:
-                    if response.status_code == 404 and url != default_url:
-                        async with client.stream("POST", default_url, headers=headers, json=payload) as retry_response:
-                            async for line in retry_response.aiter_lines():
-                                if line.startswith("data: "):
-                                    data_str = line[6:]
-                                    if data_str == "[DONE]":
-                                        return
-                                    try:
-                                        data = json.loads(data_str)
-                                        if "delta" in data and "text" in data["delta"]:
-                                            yield json.dumps({"text": data["delta"]["text"]})
-                                    except json.JSONDecodeError:
-                                        continue
-                        return
+        try:
+            async with client.stream("POST", url, headers=headers, content=body) as response:
+                if response.status_code == 404 and url != default_url:
+                    async with client.stream("POST", default_url, headers=headers, content=body) as retry_response:
+                        async for line in retry_response.aiter_lines():
+                            if line.startswith("data: "):
+                                data_str = line[6:]
+                                if data_str == "[DONE]":
+                                    return
+                                try:
+                                    data = json_loads(data_str)
+                                    if "delta" in data and "text" in data["delta"]:
+                                        yield json_dumps({"text": data["delta"]["text"]})
+                                except json.JSONDecodeError:
+                                    continue
+                    return
                     
-                    if response.status_code >= 400:
-                        error_text = await response.aread()
-                        yield json.dumps({"error": f"Claude API error ({response.status_code}): {error_text[:200].decode()}"})
-                        return
-
-                    async for line in response.aiter_lines():
-                        if line.startswith("data: "):
-                            data_str = line[6:]
-                            if data_str == "[DONE]":
+                if response.status_code >= 400:
+                    error_text = await response.aread()
+                    if response.status_code == 404 and is_model_not_found(response):
+                        mark_anthropic_model_failed(model_name, not_found=True)
+                        if model_name != candidates[-1]:
+                            continue
+                    elif is_transient_anthropic_status(response.status_code):
+                        mark_anthropic_model_failed(model_name)
+                    yield json_dumps({"error": f"Claude API error ({response.status_code}): {error_text[:200].decode()}"})
+                    return
+
+                async for line in response.aiter_lines():
+                    if line.startswith("data: "):
+                        data_str = line[6:]
+                        if data_str == "[DONE]":
+                            return
+                        try:
+                            data = json_loads(data_str)
+                            if "delta" in data and "text" in data["delta"]:
+                                yield json_dumps({"text": data["delta"]["text"]})
+                            elif "error" in data:
+                                if (data["error"] or {}).get("type") == "overloaded_error":
+                                    mark_anthropic_model_failed(model_name)
+                                yield json_dumps({"error": str(data["error"])})
                                 return
-                            try:
-                                data = json.loads(data_str)
-                                if "delta" in data and "text" in data["delta"]:
-                                    yield json.dumps({"text": data["delta"]["text"]})
-                                elif "error" in data:
-                                    yield json.dumps({"error": str(data["error"])})
-                                    return
-                            except json.JSONDecodeError:
-                                continue
-                    return  # Success
-            except Exception as e:
-                if model_name == model_list[-1]:  # Last model, yield error
-                    yield json.dumps({"error": f"All models failed: {str(e)}"})
-                continue
+                        except json.JSONDecodeError:
+                            continue
+                mark_anthropic_model_ok(model_name)
+                return  # Success
+        except Exception as e:
+            if is_transient_anthropic_failure(e):
+                mark_anthropic_model_failed(model_name)
+            if model_name == candidates[-1]:  # Last model, yield error
+                yield json_dumps({"error": f"All models failed: {str(e)}"})
+            continue
 
 
 @app.post("/ask", response_model=AskResponse)
@@ -2364,7 +3461,7 @@ async def ask_fund_stream(request: AskRequest):
     
     async def generate():
         async for chunk in stream_anthropic_answer(prompt, question=question, sources=request.sources):
-            yield f"data: {chunk}\n\n"
+            yield b"data: " + chunk + b"\n\n"
     
     return StreamingResponse(
         generate(),
@@ -2388,46 +3485,46 @@ def normalize_embedding(embedding: List[float]) -> List[float]:
     return embedding + [0.0] * (EMBEDDING_DIM - len(embedding))
 
 
-async def generate_embedding_openai(text: str) -> List[float]:
-    """Generate embedding using OpenAI API."""
+async def generate_embeddings_openai(texts: List[str]) -> List[List[float]]:
+    """Generate embeddings using OpenAI API (one request for the whole list)."""
     if not OPENAI_API_KEY:
         raise HTTPException(
             status_code=503,
             detail="OPENAI_API_KEY not set. Set it in the server environment to use OpenAI embeddings."
         )
     
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        response = await client.post(
-            "https://api.openai.com/v1/embeddings",
-            headers={
-                "Authorization": f"Bearer {OPENAI_API_KEY}",
-                "Content-Type": "application/json",
-            },
-            json={
-                "model": OPENAI_EMBEDDING_MODEL,
-                "input": text,
-            },
+    client = get_external_http()
+    response = await client.post(
+        "https://api.openai.com/v1/embeddings",
+        headers={
+            "Authorization": f"Bearer {OPENAI_API_KEY}",
+            "Content-Type": "application/json",
+        },
+        content=json_dumps({
+            "model": OPENAI_EMBEDDING_MODEL,
+            "input": texts,
+        }),
+    )
+    
+    if response.status_code >= 400:
+        error_text = response.text[:400]
+        raise HTTPException(
+            status_code=502,
+            detail=f"OpenAI embedding API error ({response.status_code}): {error_text}"
         )
-        
-        if response.status_code >= 400:
-            error_text = response.text[:400]
-            raise HTTPException(
-                status_code=502,
-                detail=f"OpenAI embedding API error ({response.status_code}): {error_text}"
-            )
-        
-        data = response.json()
-        embedding_data = data.get("data", [{}])[0] if data.get("data") else {}
-        embedding = embedding_data.get("embedding")
-        
-        if not embedding:
-            raise HTTPException(status_code=502, detail="No embedding returned from OpenAI.")
-        
-        return normalize_embedding(embedding)
+    
+    data = json_loads(response.content)
+    items = sorted(data.get("data") or [], key=lambda d: d.get("index", 0))
+    embeddings = [item.get("embedding") for item in items]
+    
+    if len(embeddings) != len(texts) or not all(embeddings):
+        raise HTTPException(status_code=502, detail="No embedding returned from OpenAI.")
+    
+    return [normalize_embedding(e) for e in embeddings]
 
 
-async def generate_embedding_voyage(text: str, input_type: str) -> List[float]:
-    """Generate embedding using VoyageAI API."""
+async def generate_embeddings_voyage(texts: List[str], input_type: str) -> List[List[float]]:
+    """Generate embeddings using VoyageAI API (one request for the whole list)."""
     if not VOYAGE_API_KEY:
         raise HTTPException(
             status_code=503,
@@ -2436,47 +3533,174 @@ async def generate_embedding_voyage(text: str, input_type: str) -> List[float]:
 
     payload = {
         "model": VOYAGE_EMBEDDING_MODEL,
-        "input": [text],
+        "input": texts,
         "input_type": input_type,
     }
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        response = await client.post(
-            "https://api.voyageai.com/v1/embeddings",
-            headers={
-                "Authorization": f"Bearer {VOYAGE_API_KEY}",
-                "Content-Type": "application/json",
-            },
-            json=payload,
-        )
+    client = get_external_http()
+    response = await client.post(
+        "https://api.voyageai.com/v1/embeddings",
+        headers={
+            "Authorization": f"Bearer {VOYAGE_API_KEY}",
+            "Content-Type": "application/json",
+        },
+        content=json_dumps(payload),
+    )
 
-        if response.status_code >= 400:
-            error_text = response.text[:400]
-            raise HTTPException(
-                status_code=502,
-                detail=f"VoyageAI embedding API error ({response.status_code}): {error_text}"
-            )
+    if response.status_code >= 400:
+        error_text = response.text[:400]
+        raise HTTPException(
+            status_code=502,
+            detail=f"VoyageAI embedding API error ({response.status_code}): {error_text}"
+        )
 
-        data = response.json() or {}
-        embedding_data = data.get("data", [{}])[0] if data.get("data") else {}
-        embedding = embedding_data.get("embedding")
+    data = json_loads(response.content) or {}
+    items = sorted(data.get("data") or [], key=lambda d: d.get("index", 0))
+    embeddings = [item.get("embedding") for item in items]
 
-        if not embedding:
-            raise HTTPException(status_code=502, detail="No embedding returned from VoyageAI.")
+    if len(embeddings) != len(texts) or not all(embeddings):
+        raise HTTPException(status_code=502, detail="No embedding returned from VoyageAI.")
 
-        return normalize_embedding(embedding)
+    return [normalize_embedding(e) for e in embeddings]
 
-async def generate_embedding_ollama(text: str) -> List[float]:
-    """Generate embedding using Ollama."""
+async def generate_embeddings_ollama(texts: List[str]) -> List[List[float]]:
+    """Generate embeddings using Ollama (/api/embed takes a list; older servers fall back per text)."""
     try:
-        response = ollama.embeddings(model=OLLAMA_EMBEDDING_MODEL, prompt=text)
+        response = await get_ollama_client().embed(
+            model=OLLAMA_EMBEDDING_MODEL, input=texts, keep_alive=OLLAMA_KEEP_ALIVE
+        )
+        embeddings = list(response.get("embeddings") or [])
     except Exception as e:
-        raise HTTPException(status_code=503, detail=f"Ollama embedding failed: {str(e)}")
+        print(f"Ollama batch embed failed, falling back to per-text embeddings: {e}")
+        embeddings = []
+        for text in texts:
+            try:
+                response = await get_ollama_client().embeddings(model=OLLAMA_EMBEDDING_MODEL, prompt=text)
+            except Exception as e:
+                raise HTTPException(status_code=503, detail=f"Ollama embedding failed: {str(e)}")
+            # Newer ollama clients return a response model rather than a dict; both support .get
+            embeddings.append(response.get("embedding") if hasattr(response, "get") else None)
 
-    embedding = response.get("embedding") if isinstance(response, dict) else None
-    if not embedding:
+    if len(embeddings) != len(texts) or not all(embeddings):
         raise HTTPException(status_code=502, detail="No embedding returned from Ollama.")
-    return normalize_embedding(embedding)
+    return [normalize_embedding(list(e)) for e in embeddings]
+
+
+EMBEDDING_MODELS = {
+    "voyage": VOYAGE_EMBEDDING_MODEL,
+    "openai": OPENAI_EMBEDDING_MODEL,
+    "ollama": OLLAMA_EMBEDDING_MODEL,
+}
+
+embedding_cache = ResponseCache(max_entries=EMBED_CACHE_MAX, db_path=EMBED_CACHE_DB, table="embed_cache")
+
+
+def embedding_cache_key(provider: str, input_type: str, text: str) -> str:
+    digest = hashlib.sha256()
+    for part in (provider, EMBEDDING_MODELS.get(provider, ""), input_type, text):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+async def generate_embeddings(provider: str, texts: List[str], input_type: str) -> List[List[float]]:
+    if provider == "voyage":
+        return await generate_embeddings_voyage(texts, input_type)
+    if provider == "openai":
+        return await generate_embeddings_openai(texts)
+    if provider == "ollama":
+        return await generate_embeddings_ollama(texts)
+    raise HTTPException(
+        status_code=503,
+        detail=(
+            f"EMBEDDINGS_PROVIDER '{provider}' not supported. "
+            "Use 'voyage', 'openai', or 'ollama'."
+        )
+    )
+
+
+async def get_embeddings(texts: List[str], input_type: str, provider: str = EMBEDDINGS_PROVIDER) -> List[List[float]]:
+    """
+    Embed texts, serving repeats from embedding_cache. Misses are de-duplicated and sent
+    to the provider in batches of EMBED_BATCH_SIZE.
+    """
+    keys = [embedding_cache_key(provider, input_type, text) for text in texts]
+    results: List[Optional[List[float]]] = [embedding_cache.get(key) for key in keys]
+
+    pending = list(dict.fromkeys(text for text, res in zip(texts, results) if res is None))
+    fresh: Dict[str, List[float]] = {}
+    batch_size = max(1, EMBED_BATCH_SIZE)
+    for i in range(0, len(pending), batch_size):
+        batch = pending[i:i + batch_size]
+        fresh.update(zip(batch, await generate_embeddings(provider, batch, input_type)))
+
+    for idx, (key, text) in enumerate(zip(keys, texts)):
+        if results[idx] is None:
+            results[idx] = fresh[text]
+            embedding_cache.put(key, fresh[text])
+    return results  # type: ignore[return-value]
+
+
+class EmbedBatcher:
+    """
+    Coalesces single-text embedding requests that arrive within window_seconds of each other
+    (per provider + input_type) into one get_embeddings call, so concurrent /embed/query calls
+    cost one provider request instead of one each.
+    """
+
+    def __init__(self, window_seconds: float, max_batch: int):
+        self.window_seconds = window_seconds
+        self.max_batch = max(1, max_batch)
+        self._pending: Dict[Tuple[str, str], List[Tuple[str, "asyncio.Future[List[float]]"]]] = {}
+        self._tasks: set = set()
+
+    async def submit(self, text: str, input_type: str, provider: str = EMBEDDINGS_PROVIDER) -> List[float]:
+        if self.window_seconds <= 0:
+            return (await get_embeddings([text], input_type, provider))[0]
+        loop = asyncio.get_running_loop()
+        key = (provider, input_type)
+        batch = self._pending.get(key)
+        if batch is None:
+            batch = self._pending[key] = []
+            loop.call_later(self.window_seconds, self._flush, key, batch)
+        future = loop.create_future()
+        batch.append((text, future))
+        if len(batch) >= self.max_batch:
+            self._flush(key, batch)
+        return await future
+
+    def _flush(self, key: Tuple[str, str], batch: List[Tuple[str, "asyncio.Future[List[float]]"]]) -> None:
+        # The window timer and a full batch can both fire; only the first one sends it
+        if self._pending.get(key) is not batch:
+            return
+        del self._pending[key]
+        task = asyncio.ensure_future(self._run(key, batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, key: Tuple[str, str], batch: List[Tuple[str, "asyncio.Future[List[float]]"]]) -> None:
+        provider, input_type = key
+        try:
+            embeddings = await get_embeddings([text for text, _ in batch], input_type, provider)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), embedding in zip(batch, embeddings):
+            if not future.done():  # the caller may have disconnected
+                future.set_result(embedding)
+
+
+embed_batcher = EmbedBatcher(window_seconds=EMBED_COALESCE_MS / 1000.0, max_batch=EMBED_BATCH_SIZE)
+
+
+def parse_input_type(value: Optional[str]) -> str:
+    input_type = (value or "document").strip().lower()
+    if input_type not in ["document", "query"]:
+        input_type = "document"
+    return input_type
+
 
 @app.post("/embed/query", response_model=EmbedResponse)
 async def embed_query(request: EmbedRequest):
@@ -2485,25 +3709,7 @@ async def embed_query(request: EmbedRequest):
         raise HTTPException(status_code=400, detail="text is required.")
 
     try:
-        input_type = (request.input_type or "document").strip().lower()
-        if input_type not in ["document", "query"]:
-            input_type = "document"
-
-        if EMBEDDINGS_PROVIDER == "voyage":
-            embedding = await generate_embedding_voyage(text, input_type)
-        elif EMBEDDINGS_PROVIDER == "openai":
-            embedding = await generate_embedding_openai(text)
-        elif EMBEDDINGS_PROVIDER == "ollama":
-            embedding = await generate_embedding_ollama(text)
-        else:
-            raise HTTPException(
-                status_code=503,
-                detail=(
-                    f"EMBEDDINGS_PROVIDER '{EMBEDDINGS_PROVIDER}' not supported. "
-                    "Use 'voyage', 'openai', or 'ollama'."
-                )
-            )
-        
+        embedding = await embed_batcher.submit(text, parse_input_type(request.input_type))
         return EmbedResponse(embedding=embedding)
     except HTTPException:
         raise
@@ -2513,6 +3719,24 @@ async def embed_query(request: EmbedRequest):
             detail=f"Embedding generation failed: {str(e)}"
         )
 
+@app.post("/embed/batch", response_model=EmbedBatchResponse)
+async def embed_batch(request: EmbedBatchRequest):
+    """Embed many texts (e.g. document chunks) with as few provider calls as possible."""
+    texts = [(t or "").strip() for t in request.texts]
+    if not texts or not all(texts):
+        raise HTTPException(status_code=400, detail="texts must be a non-empty list of non-empty strings.")
+
+    try:
+        embeddings = await get_embeddings(texts, parse_input_type(request.input_type))
+        return EmbedBatchResponse(embeddings=embeddings)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Embedding generation failed: {str(e)}"
+        )
+
 @app.post("/ingest/google-drive", response_model=GoogleDriveIngestResponse)
 async def ingest_google_drive(request: GoogleDriveIngestRequest):
     if not request.access_token:
@@ -2545,20 +3769,20 @@ async def ingest_google_drive(request: GoogleDriveIngestRequest):
         "Accept": "text/plain" if kind != "spreadsheet" else "text/csv"
     }
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        res = await client.get(api_url, headers=headers)
-        if res.status_code >= 400:
-            error_detail = res.text[:500] if res.text else "No error details"
-            raise HTTPException(
-                status_code=res.status_code,
-                detail=f"Google Drive API failed (status {res.status_code}): {error_detail}. Make sure you have Drive access and the file is accessible."
-            )
-        content = res.text
-        
-        # Log if content is empty
-        if not content or len(content.strip()) == 0:
-            print(f"WARNING: Google Drive API returned empty content for {file_id}. Status: {res.status_code}")
-            content = f"[Empty content from Google Drive file: {file_id}]"
+    client = get_external_http()
+    res = await client.get(api_url, headers=headers)
+    if res.status_code >= 400:
+        error_detail = res.text[:500] if res.text else "No error details"
+        raise HTTPException(
+            status_code=res.status_code,
+            detail=f"Google Drive API failed (status {res.status_code}): {error_detail}. Make sure you have Drive access and the file is accessible."
+        )
+    content = res.text
+    
+    # Log if content is empty
+    if not content or len(content.strip()) == 0:
+        print(f"WARNING: Google Drive API returned empty content for {file_id}. Status: {res.status_code}")
+        content = f"[Empty content from Google Drive file: {file_id}]"
 
     title = f"{kind}-{file_id[:8]}"
     return GoogleDriveIngestResponse(title=title, content=content, raw_content=content, sourceType=source_type)
@@ -2572,17 +3796,91 @@ class ValidationResponse(BaseModel):
     missingFields: Dict[str, List[str]]  # { "startups": ["geoMarkets"], "investors": ["minTicketSize"] }
     incompleteFields: Dict[str, List[str]]  # Fields that exist but are incomplete
     suggestions: List[str]  # Suggestions for what to add
-    extractedData: Dict[str, Any]  # What was successfully extracted
+    extractedData: Optional[Dict[str, Any]] = None  # What was successfully extracted (only with includeData)
+
 
-@app.post("/validate-file", response_model=FileValidationResponse)
+# Fields /validate reports as missing, in report order; bit i of a missing-field mask is field i
+_STARTUP_CHECK_FIELDS = ("companyName", "geoMarkets", "industry", "fundingTarget", "fundingStage")
+_INVESTOR_CHECK_FIELDS = (
+    "firmName", "memberName", "geoFocus", "industryPreferences", "stagePreferences",
+    "minTicketSize", "maxTicketSize", "totalSlots",
+)
+
+
+def fields_from_mask(mask: int, fields: Tuple[str, ...]) -> List[str]:
+    """Names of the fields whose bits are set in `mask`."""
+    if not mask:
+        return []
+    return [field for bit, field in enumerate(fields) if mask >> bit & 1]
+
+
+# "Add ... for <name>" suggestion per field, indexed like the field tuples above (None: no suggestion)
+_STARTUP_SUGGESTIONS = (
+    None,
+    "Add geographic markets for %s",
+    None,
+    "Add funding target amount for %s",
+    "Add funding stage (Pre-seed, Seed, Series A, etc.) for %s",
+)
+_INVESTOR_SUGGESTIONS = (
+    None,
+    "Add investor member name (person) for %s",
+    "Add geographic focus for %s",
+    "Add industry preferences for %s",
+    "Add stage preferences (Seed, Series A, etc.) for %s",
+    "Add minimum ticket size for %s",
+    "Add maximum ticket size for %s",
+    "Add number of meeting slots for %s",
+)
+
+
+def add_suggestions(
+    suggestions: List[str], suggested: Dict[str, int], name: str, mask: int, templates: Tuple[Optional[str], ...]
+) -> None:
+    """
+    Append the suggestions for the missing-field bits in `mask` that `name` hasn't had yet.
+    Investor rows repeat per firm member, so `suggested` keeps the bits already covered per name
+    and each message is formatted once.
+    """
+    covered = suggested.get(name, 0)
+    new = mask & ~covered
+    if not new:
+        return
+    suggested[name] = covered | new
+    for bit, template in enumerate(templates):
+        if new >> bit & 1 and template is not None:
+            suggestions.append(template % name)
+
+
+# Records per chunk written by the NDJSON /validate stream (one send per chunk, not per line)
+VALIDATION_NDJSON_CHUNK = 256
+
+
+def iter_validation_ndjson(summary: Dict[str, Any], result: ConversionResponse) -> Iterator[bytes]:
+    """
+    /validate as NDJSON: the summary object on the first line, then one {"type", "data"} line per
+    extracted startup/investor, so large results are never held as one JSON document.
+    """
+    yield json_dumps(summary) + b"\n"
+    for kind, records in (("startup", result.startups), ("investor", result.investors)):
+        for start in range(0, len(records), VALIDATION_NDJSON_CHUNK):
+            yield b"".join(
+                json_dumps({"type": kind, "data": record.__dict__}) + b"\n"
+                for record in records[start:start + VALIDATION_NDJSON_CHUNK]
+            )
+
+
+# Returns a pre-rendered Response, so there's no response_model to validate against; the model
+# is only registered for the OpenAPI schema
+@app.post("/validate-file", response_model=None, responses={200: {"model": FileValidationResponse}})
 async def validate_file(file: UploadFile = File(...), dataType: Optional[str] = None):
     """
     Validate an uploaded file (any supported format) and return:
-    - row-level errors with explicit row numbers
+    - conversion errors and warnings (rows missing identifying fields are reported while records are built)
     - CSV templates with extracted rows prefilled and missing columns preserved
     """
     try:
-        file_ext, text_content = await extract_text_content(file)
+        file_ext, text_content = await extract_text_cached(file)
         conversion_request = ConversionRequest(
             data=text_content,
             dataType=dataType,
@@ -2590,31 +3888,35 @@ async def validate_file(file: UploadFile = File(...), dataType: Optional[str] =
         )
         conversion_result = await convert_data(conversion_request)
 
-        row_errors = validate_structured_rows(conversion_result.startups, conversion_result.investors)
-        errors = (conversion_result.errors or []) + row_errors
+        # Rows are already checked for their identifying fields while convert_data builds them
+        errors = conversion_result.errors or []
         warnings = conversion_result.warnings or []
 
-        startup_csv = build_startup_csv(conversion_result.startups) if conversion_result.startups else build_startup_csv([])
-        investor_csv = build_investor_csv(conversion_result.investors) if conversion_result.investors else build_investor_csv([])
+        startup_csv = build_startup_csv(conversion_result.startups or [])
+        investor_csv = build_investor_csv(conversion_result.investors or [])
 
-        return FileValidationResponse(
+        return model_json_response(FileValidationResponse(
             isValid=len(errors) == 0,
             errors=errors,
             warnings=warnings,
             detectedType=conversion_result.detectedType,
             startupCsvTemplate=startup_csv,
             investorCsvTemplate=investor_csv,
-        )
+        ))
     except HTTPException:
         raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"File validation failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"File validation failed: {str(e)}") from e
 
-@app.post("/validate", response_model=ValidationResponse)
-async def validate_data(request: ValidationRequest):
+@app.post("/validate", response_model=None, responses={200: {"model": ValidationResponse}})
+async def validate_data(
+    request: ValidationRequest, includeData: bool = False, accept: Optional[str] = Header(None)
+):
     """
     Validate data and identify what's missing
     This is what the investment team needs - tells them what to add!
+    The converted rows are only echoed back as extractedData with ?includeData=true; with
+    `Accept: application/x-ndjson` they are streamed as lines after the summary instead.
     """
     try:
         # First, try to convert the data
@@ -2624,93 +3926,104 @@ async def validate_data(request: ValidationRequest):
         )
         conversion_result = await convert_data(conversion_request)
         
-        missing_fields = {"startups": [], "investors": []}
+        # Missing fields as bitmasks over _STARTUP_CHECK_FIELDS / _INVESTOR_CHECK_FIELDS, OR-ed
+        # across all records and expanded to names once at the end
+        startups_missing = 0
+        investors_missing = 0
         incomplete_fields = {"startups": [], "investors": []}
         suggestions = []
+        # Per record type: name -> bits that already have a suggestion
+        startups_suggested = {}
+        investors_suggested = {}
         
         # Check startups
         for startup in conversion_result.startups:
-            startup_missing = []
-            startup_incomplete = []
-            
-            if not startup.companyName or (isinstance(startup.companyName, str) and startup.companyName.strip() == ""):
-                startup_missing.append("companyName")
-            if not startup.geoMarkets or len(startup.geoMarkets) == 0:
-                startup_missing.append("geoMarkets")
-                suggestions.append(f"Add geographic markets for {startup.companyName}")
-            if not startup.industry or (isinstance(startup.industry, str) and startup.industry.strip() == ""):
-                startup_missing.append("industry")
-            if not startup.fundingTarget or startup.fundingTarget == 0:
-                startup_missing.append("fundingTarget")
-                suggestions.append(f"Add funding target amount for {startup.companyName}")
-            if not startup.fundingStage or (isinstance(startup.fundingStage, str) and startup.fundingStage.strip() == ""):
-                startup_missing.append("fundingStage")
-                suggestions.append(f"Add funding stage (Pre-seed, Seed, Series A, etc.) for {startup.companyName}")
-            
-            if startup_missing:
-                missing_fields["startups"].extend(startup_missing)
+            mask = 0
+            if not startup.companyName or startup.companyName.isspace():
+                mask |= 1 << 0  # companyName
+            if not startup.geoMarkets:
+                mask |= 1 << 1  # geoMarkets
+            if not startup.industry or startup.industry.isspace():
+                mask |= 1 << 2  # industry
+            if not startup.fundingTarget:
+                mask |= 1 << 3  # fundingTarget
+            if not startup.fundingStage or startup.fundingStage.isspace():
+                mask |= 1 << 4  # fundingStage
+            if mask:
+                startups_missing |= mask
+                add_suggestions(
+                    suggestions, startups_suggested, startup.companyName or 'this startup', mask, _STARTUP_SUGGESTIONS
+                )
         
         # Check investors
         for investor in conversion_result.investors:
-            investor_missing = []
-            investor_incomplete = []
-            
-            if not investor.firmName or (isinstance(investor.firmName, str) and investor.firmName.strip() == ""):
-                investor_missing.append("firmName")
-            if not investor.memberName or (isinstance(investor.memberName, str) and investor.memberName.strip() == ""):
-                investor_missing.append("memberName")
-                suggestions.append(f"Add investor member name (person) for {investor.firmName or 'this investor'}")
-            if not investor.geoFocus or len(investor.geoFocus) == 0:
-                investor_missing.append("geoFocus")
-                suggestions.append(f"Add geographic focus for {investor.firmName}")
-            if not investor.industryPreferences or len(investor.industryPreferences) == 0:
-                investor_missing.append("industryPreferences")
-                suggestions.append(f"Add industry preferences for {investor.firmName}")
-            if not investor.stagePreferences or len(investor.stagePreferences) == 0:
-                investor_missing.append("stagePreferences")
-                suggestions.append(f"Add stage preferences (Seed, Series A, etc.) for {investor.firmName}")
-            if not investor.minTicketSize or investor.minTicketSize == 0:
-                investor_missing.append("minTicketSize")
-                suggestions.append(f"Add minimum ticket size for {investor.firmName}")
-            if not investor.maxTicketSize or investor.maxTicketSize == 0:
-                investor_missing.append("maxTicketSize")
-                suggestions.append(f"Add maximum ticket size for {investor.firmName}")
-            if not investor.totalSlots or investor.totalSlots == 0:
-                investor_missing.append("totalSlots")
-                suggestions.append(f"Add number of meeting slots for {investor.firmName}")
-            
-            if investor_missing:
-                missing_fields["investors"].extend(investor_missing)
+            mask = 0
+            if not investor.firmName or investor.firmName.isspace():
+                mask |= 1 << 0  # firmName
+            if not investor.memberName or investor.memberName.isspace():
+                mask |= 1 << 1  # memberName
+            if not investor.geoFocus:
+                mask |= 1 << 2  # geoFocus
+            if not investor.industryPreferences:
+                mask |= 1 << 3  # industryPreferences
+            if not investor.stagePreferences:
+                mask |= 1 << 4  # stagePreferences
+            if not investor.minTicketSize:
+                mask |= 1 << 5  # minTicketSize
+            if not investor.maxTicketSize:
+                mask |= 1 << 6  # maxTicketSize
+            if not investor.totalSlots:
+                mask |= 1 << 7  # totalSlots
+            if mask:
+                investors_missing |= mask
+                add_suggestions(
+                    suggestions, investors_suggested, investor.firmName or 'this investor', mask, _INVESTOR_SUGGESTIONS
+                )
         
-        # Remove duplicates
-        missing_fields["startups"] = list(set(missing_fields["startups"]))
-        missing_fields["investors"] = list(set(missing_fields["investors"]))
+        missing_fields = {
+            "startups": fields_from_mask(startups_missing, _STARTUP_CHECK_FIELDS),
+            "investors": fields_from_mask(investors_missing, _INVESTOR_CHECK_FIELDS),
+        }
         
-        is_valid = (
-            len(missing_fields["startups"]) == 0 and
-            len(missing_fields["investors"]) == 0 and
-            len(conversion_result.errors) == 0
-        )
+        is_valid = not (startups_missing or investors_missing or conversion_result.errors)
         
-        return ValidationResponse(
-            isValid=is_valid,
-            missingFields=missing_fields,
-            incompleteFields=incomplete_fields,
-            suggestions=suggestions,
-            extractedData={
-                "startups": [s.dict() for s in conversion_result.startups],
-                "investors": [i.dict() for i in conversion_result.investors],
+        # Plain dict rendered by orjson: every value here is already the right shape, so skip
+        # FastAPI's response-model validation and jsonable_encoder walk over extractedData. The
+        # record models are written straight from their fields, and every key is a str.
+        content = {
+            "isValid": is_valid,
+            "missingFields": missing_fields,
+            "incompleteFields": incomplete_fields,
+            "suggestions": suggestions,
+        }
+        if includeData and accept and "application/x-ndjson" in accept:
+            content["detectedType"] = conversion_result.detectedType
+            content["confidence"] = conversion_result.confidence
+            return StreamingResponse(
+                iter_validation_ndjson(content, conversion_result), media_type="application/x-ndjson"
+            )
+        if includeData:
+            content["extractedData"] = {
+                "startups": conversion_result.startups,
+                "investors": conversion_result.investors,
                 "detectedType": conversion_result.detectedType,
                 "confidence": conversion_result.confidence
             }
-        )
+        return StrKeyOrjsonResponse(content=content)
         
+    except HTTPException:
+        # Conversion errors (400/502/503...) keep their status instead of becoming a 500
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Validation failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Validation failed: {str(e)}") from e
 
 if __name__ == "__main__":
-    import os
     import uvicorn
-    port = int(os.environ.get("PORT", os.environ.get("OLLAMA_CONVERTER_PORT", "8000")))
-    uvicorn.run(app, host="0.0.0.0", port=port)
-
+    # loop/http default to "auto": uvloop and httptools (uvicorn[standard]) when installed
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=PORT,
+        workers=WEB_CONCURRENCY,
+        app_dir=os.path.dirname(os.path.abspath(__file__)),
+    )
@@ -0,0 +1,76 @@
+"""
+Unit tests for split_model_input (how long inputs are cut into model-sized chunks)
+Run with: python -m pytest test_split_model_input.py
+"""
+
+import pytest
+
+import main
+
+
+@pytest.fixture(autouse=True)
+def small_chunks(monkeypatch):
+    monkeypatch.setattr(main, "MAX_MODEL_INPUT_CHARS", 1000)
+    monkeypatch.setattr(main, "MODEL_INPUT_CHUNK_OVERLAP", 100)
+    monkeypatch.setattr(main, "MAX_MODEL_INPUT_CHUNKS", 50)
+
+
+def make_csv(rows):
+    header = "firmName,industry,ticket\n"
+    body = "".join(f"Firm {i},SaaS,100k-500k\n" for i in range(rows))
+    return header, header + body
+
+
+def test_short_input_is_one_chunk():
+    chunks, truncated = main.split_model_input("a,b\n1,2\n")
+    assert chunks == ["a,b\n1,2\n"]
+    assert truncated is False
+
+
+def test_csv_chunks_repeat_header_and_start_on_a_row():
+    header, data = make_csv(200)
+    rows = set(data.splitlines(keepends=True)[1:])
+    chunks, truncated = main.split_model_input(data)
+    assert len(chunks) > 1
+    assert truncated is False
+    for chunk in chunks:
+        assert chunk.startswith(header)
+        assert len(chunk) <= main.MAX_MODEL_INPUT_CHARS
+        body = chunk[len(header):].splitlines(keepends=True)
+        assert body and all(line in rows for line in body)
+
+
+def test_csv_chunks_cover_every_row_with_overlap():
+    header, data = make_csv(200)
+    chunks, _ = main.split_model_input(data)
+    seen = [line for chunk in chunks for line in chunk[len(header):].splitlines()]
+    expected = data.splitlines()[1:]
+    assert set(seen) == set(expected)
+    # Neighbouring chunks share at least one whole row
+    for previous, current in zip(chunks, chunks[1:]):
+        assert current[len(header):].splitlines()[0] in previous.splitlines()
+
+
+def test_prose_chunks_get_no_header():
+    line = "Acme Ventures invests in seed stage fintech across Europe and the US.\n"
+    data = line * 60
+    chunks, _ = main.split_model_input(data)
+    assert len(chunks) > 1
+    for chunk in chunks:
+        assert chunk.startswith("Acme Ventures")
+        assert len(chunk) <= main.MAX_MODEL_INPUT_CHARS
+
+
+def test_text_without_line_breaks_still_overlaps():
+    data = "x" * 2500
+    chunks, truncated = main.split_model_input(data)
+    assert truncated is False
+    assert "".join(chunk[100:] if i else chunk for i, chunk in enumerate(chunks)) == data
+
+
+def test_chunk_limit_reports_truncation(monkeypatch):
+    monkeypatch.setattr(main, "MAX_MODEL_INPUT_CHUNKS", 2)
+    _, data = make_csv(200)
+    chunks, truncated = main.split_model_input(data)
+    assert len(chunks) == 2
+    assert truncated is True